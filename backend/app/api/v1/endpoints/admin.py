@@ -1,25 +1,67 @@
+import orjson
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db.session import get_db
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from app.db.session import get_db, SessionLocal
+from app.core.cache import cached
+from app.db.views import ENDPOINT_STATS_VIEW, uses_materialized_views
 from app.models.all_models import User, AILog, Recommendation
 
 router = APIRouter()
 
+
+def count_rows(db: Session, *models, exact: bool = False) -> dict:
+    """
+    Row counts per model, keyed by table name.
+    Unless `exact` is set, PostgreSQL returns the planner estimates from
+    pg_class (O(1), as fresh as the last ANALYZE); tables never analyzed fall
+    back to COUNT(*). Other dialects always count exactly.
+    """
+    tables = [model.__tablename__ for model in models]
+    estimates = {}
+    if not exact and db.get_bind().dialect.name == "postgresql":
+        estimates = dict(db.execute(
+            text("SELECT relname, reltuples::bigint FROM pg_class WHERE relname = ANY(:tables)"),
+            {"tables": tables}
+        ).all())
+    
+    counts = {}
+    for model, table in zip(models, tables):
+        estimate = estimates.get(table)
+        counts[table] = estimate if estimate is not None and estimate >= 0 else db.query(model).count()
+    return counts
+
+
 @router.get("/stats")
-def get_admin_stats(db: Session = Depends(get_db)):
-    """Get overall system statistics"""
-    total_users = db.query(User).count()
-    total_logs = db.query(AILog).count()
-    total_recommendations = db.query(Recommendation).count()
+@cached(ttl=30, key=lambda **kwargs: ("admin:stats", kwargs.get("exact", False)), stale_on=SQLAlchemyError)
+def get_admin_stats(exact: bool = False, db: Session = Depends(get_db)):
+    """
+    Get overall system statistics.
+    Totals are approximate unless `exact=true` is passed.
+    Cached for 30s; the last result is served if the database is unreachable.
+    On PostgreSQL the per-endpoint breakdown comes from a materialized view
+    refreshed every minute.
+    """
+    counts = count_rows(db, User, AILog, Recommendation, exact=exact)
+    total_users = counts[User.__tablename__]
+    total_logs = counts[AILog.__tablename__]
+    total_recommendations = counts[Recommendation.__tablename__]
     
-    endpoint_stats = db.query(
-        AILog.endpoint,
-        func.count(AILog.id).label('count'),
-        func.avg(AILog.duration_ms).label('avg_duration'),
-        func.sum(AILog.cost).label('total_cost'),
-        func.sum(AILog.tokens_used).label('total_tokens')
-    ).group_by(AILog.endpoint).all()
+    if uses_materialized_views(db.get_bind()):
+        endpoint_stats = db.execute(text(
+            "SELECT endpoint, count, avg_duration, total_cost, total_tokens "
+            f"FROM {ENDPOINT_STATS_VIEW}"
+        )).all()
+    else:
+        endpoint_stats = db.query(
+            AILog.endpoint,
+            func.count(AILog.id).label('count'),
+            func.avg(AILog.duration_ms).label('avg_duration'),
+            func.sum(AILog.cost).label('total_cost'),
+            func.sum(AILog.tokens_used).label('total_tokens')
+        ).group_by(AILog.endpoint).all()
     
     return {
         "total_users": total_users,
@@ -38,42 +80,83 @@ def get_admin_stats(db: Session = Depends(get_db)):
     }
 
 @router.get("/logs")
-def get_admin_logs(limit: int = 50, db: Session = Depends(get_db)):
+def get_admin_logs(limit: int = 50):
     """Get recent AI logs"""
-    logs = db.query(AILog).order_by(AILog.created_at.desc()).limit(limit).all()
-    
+    return StreamingResponse(_stream_logs(limit), media_type="application/json")
+
+
+def _log_entry(log) -> dict:
     return {
-        "logs": [
-            {
-                "id": str(log.id),
-                "user_id": str(log.user_id) if log.user_id else None,
-                "endpoint": log.endpoint,
-                "duration_ms": log.duration_ms,
-                "tokens_used": log.tokens_used,
-                "model": log.model,
-                "cost": log.cost,
-                "error": log.error,
-                "created_at": log.created_at.isoformat()
-            }
-            for log in logs
-        ]
+        "id": str(log.id),
+        "user_id": str(log.user_id) if log.user_id else None,
+        "endpoint": log.endpoint,
+        "duration_ms": log.duration_ms,
+        "tokens_used": log.tokens_used,
+        "model": log.model,
+        "cost": log.cost,
+        "error": log.error,
+        "created_at": log.created_at.isoformat()
     }
 
+
+def _stream_logs(limit: int):
+    """
+    Yield the logs response as JSON chunks, one per 500 rows fetched through
+    a server-side cursor, so large limits keep memory flat without a
+    separate write per row.
+    The session is owned here because it must outlive the endpoint call.
+    """
+    db = SessionLocal()
+    try:
+        # Select only the listed columns: skips the JSON payload columns and ORM hydration
+        result = db.execute(
+            select(
+                AILog.id,
+                AILog.user_id,
+                AILog.endpoint,
+                AILog.duration_ms,
+                AILog.tokens_used,
+                AILog.model,
+                AILog.cost,
+                AILog.error,
+                AILog.created_at
+            )
+            .order_by(AILog.created_at.desc())
+            .limit(limit)
+            .execution_options(yield_per=500)
+        )
+
+        yield b'{"logs":['
+        separator = b''
+        for rows in result.partitions():
+            yield separator + b','.join(orjson.dumps(_log_entry(log)) for log in rows)
+            separator = b','
+        yield b']}'
+    finally:
+        db.close()
+
 @router.get("/users")
 def get_admin_users(db: Session = Depends(get_db)):
     """Get all users with usage statistics"""
+    # Count each table in one grouped scan and join in Python. A single query
+    # outer-joining both tables would build logs x recommendations rows per user.
     users = db.query(User).all()
+    log_counts = dict(db.query(AILog.user_id, func.count(AILog.id)).group_by(AILog.user_id).all())
+    rec_counts = dict(
+        db.query(Recommendation.user_id, func.count(Recommendation.id)).group_by(Recommendation.user_id).all()
+    )
     
-    result = []
-    for user in users:
-        # log_count = db.query(AILog).filter(AILog.user_id == user.id).count()
-        # rec_count = db.query(Recommendation).filter(Recommendation.user_id == user.id).count()
-        
-        result.append({
-            "id": str(user.id),
-            "email": user.email,
-            "clerk_id": user.clerk_user_id,
-            "created_at": user.created_at.isoformat() if user.created_at else None
-        })
-    
-    return {"users": result}
+    return {
+        "users": [
+            {
+                "id": str(user.id),
+                "email": user.email,
+                "clerk_id": user.clerk_user_id,
+                "is_admin": bool(user.is_admin),
+                "created_at": user.created_at.isoformat() if user.created_at else None,
+                "total_logs": log_counts.get(user.id, 0),
+                "total_recommendations": rec_counts.get(user.id, 0)
+            }
+            for user in users
+        ]
+    }
@@ -1,39 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import update, null
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Dict
 
 from app.db.session import get_db
 from app.core.security import get_current_user
-from app.core.encryption import encrypt_tokens, decrypt_tokens
+from app.core.encryption import decrypt_tokens
+from app.core.http import compute_etag, etag_matches, json_response, not_modified
 from app.models.all_models import User
+from app.services.user_service import get_current_db_user, save_calendar_tokens
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Clients must revalidate so a disconnect is seen immediately
+TOKENS_CACHE_CONTROL = "private, no-cache"
+
 
 class CalendarTokensRequest(BaseModel):
     """Request body for storing calendar tokens."""
     tokens: Dict
 
 
-def get_or_create_user(clerk_user_id: str, email: Optional[str], db: Session) -> User:
-    """Get existing user or create a new one."""
-    user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-    if not user:
-        email = email or f"{clerk_user_id}@noemail.com"
-        user = User(clerk_user_id=clerk_user_id, email=email)
-        db.add(user)
-        try:
-            db.commit()
-            db.refresh(user)
-        except Exception as e:
-            db.rollback()
-            user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-            if not user:
-                raise e
-    return user
-
-
 @router.get("/protected")
 def read_protected(user: dict = Depends(get_current_user)):
     return {"message": "You are authenticated", "user_id": user.get("sub")}
@@ -42,21 +33,15 @@ def read_protected(user: dict = Depends(get_current_user)):
 @router.post("/calendar-tokens")
 def store_calendar_tokens(
     request: CalendarTokensRequest,
-    user_data: dict = Depends(get_current_user),
+    user: User = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
     Store encrypted calendar tokens for the authenticated user.
     Tokens are encrypted before being stored in the database.
     """
-    clerk_user_id = user_data.get("sub")
-    user = get_or_create_user(clerk_user_id, user_data.get("email"), db)
-    
     try:
-        # Encrypt tokens before storage
-        encrypted = encrypt_tokens(request.tokens)
-        user.calendar_tokens = encrypted
-        db.commit()
+        save_calendar_tokens(user, request.tokens, db)
         
         return {"success": True, "message": "Calendar tokens stored securely"}
     except ValueError as e:
@@ -68,28 +53,28 @@ def store_calendar_tokens(
 
 
 @router.get("/calendar-tokens")
-def get_calendar_tokens(
-    user_data: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def get_calendar_tokens(request: Request, user: User = Depends(get_current_db_user)):
     """
     Retrieve decrypted calendar tokens for the authenticated user.
     Returns the tokens or null if not connected.
     """
-    clerk_user_id = user_data.get("sub")
-    user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-    
-    if not user or not user.calendar_tokens:
+    if not user.calendar_tokens:
         return {"connected": False, "tokens": None}
     
+    # The ciphertext changes whenever tokens are re-stored, so it identifies the
+    # response and unchanged tokens are answered without decrypting
+    etag = compute_etag(user.calendar_tokens.encode())
+    if etag_matches(request, etag):
+        return not_modified(etag, TOKENS_CACHE_CONTROL)
+    
     try:
         tokens = decrypt_tokens(user.calendar_tokens)
         if tokens:
-            return {"connected": True, "tokens": tokens}
+            return json_response({"connected": True, "tokens": tokens}, etag, TOKENS_CACHE_CONTROL)
         else:
             return {"connected": False, "tokens": None}
     except Exception as e:
-        print(f"Error decrypting tokens: {e}")
+        logger.warning("Error decrypting tokens: %s", e)
         return {"connected": False, "tokens": None}
 
 
@@ -102,10 +87,12 @@ def delete_calendar_tokens(
     Remove calendar tokens for the authenticated user (disconnect calendar).
     """
     clerk_user_id = user_data.get("sub")
-    user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-    
-    if user:
-        user.calendar_tokens = None
-        db.commit()
+    # Single UPDATE, no need to load the user row
+    db.execute(
+        update(User)
+        .where(User.clerk_user_id == clerk_user_id)
+        .values(calendar_tokens=null(), calendar_tokens_hash=None)
+    )
+    db.commit()
     
     return {"success": True, "message": "Calendar disconnected"}
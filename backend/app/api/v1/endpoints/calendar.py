@@ -1,8 +1,9 @@
+import asyncio
+import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.db.session import get_db
-from app.core.security import get_current_user
-from app.services.google_calendar_service import GoogleCalendarService
+from app.services.google_calendar_service import gcal_service
 from app.schemas.calendar import (
     CalendarAuthRequest, 
     CalendarTokenRequest, 
@@ -10,30 +11,35 @@ from app.schemas.calendar import (
     TodayEventsRequest
 )
 from app.schemas.optimization import CommitScheduleRequest
+from app.services.user_service import get_current_db_user, save_calendar_tokens
 from app.models.all_models import User
 from app.core.exceptions import TimeOptiException
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime, date, time, timedelta
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
-gcal_service = GoogleCalendarService()
 
-# Helper function (duplicated for now, should be in user service)
-def get_or_create_user(clerk_user_id: str, email: Optional[str], db: Session) -> User:
-    user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-    if not user:
-        email = email or f"{clerk_user_id}@noemail.com"
-        user = User(clerk_user_id=clerk_user_id, email=email)
-        db.add(user)
-        try:
-            db.commit()
-            db.refresh(user)
-        except Exception as e:
-            db.rollback()
-            user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-            if not user:
-                raise e
-    return user
+EVENT_DESCRIPTION_PREFIX = "Scheduled via TimeOpti.\nReasoning: "
+
+def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    # fromisoformat accepts a trailing 'Z' from Python 3.11
+    return datetime.fromisoformat(value) if value else None
+
+async def _store_refreshed_tokens(tokens: dict, user: User, db: Session) -> None:
+    """
+    Store the user's calendar tokens with the access token refreshed while
+    serving `tokens`, so later requests and restarts don't refresh it again.
+    """
+    refreshed_tokens = gcal_service.get_refreshed_tokens(tokens)
+    if refreshed_tokens is None:
+        return
+    try:
+        await asyncio.to_thread(save_calendar_tokens, user, refreshed_tokens, db)
+    except ValueError as e:
+        # ENCRYPTION_KEY not set; the refreshed token is still reused in memory
+        logger.warning("Could not store refreshed calendar tokens: %s", e)
 
 @router.post("/calendar/auth-url")
 def get_calendar_auth_url(request: CalendarAuthRequest):
@@ -47,82 +53,63 @@ def get_calendar_auth_url(request: CalendarAuthRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/calendar/exchange-token")
-def exchange_calendar_token(request: CalendarTokenRequest, user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+def exchange_calendar_token(request: CalendarTokenRequest, user: User = Depends(get_current_db_user), db: Session = Depends(get_db)):
     """Exchange OAuth code for tokens and store them in the database"""
-    from app.core.encryption import encrypt_tokens
-    
     try:
         tokens = gcal_service.exchange_code_for_tokens(request.code, request.redirect_uri)
         
         # Store encrypted tokens in user's record
-        clerk_user_id = user_data.get("sub")
-        user = get_or_create_user(clerk_user_id, user_data.get("email"), db)
-        
         try:
-            encrypted = encrypt_tokens(tokens)
-            user.calendar_tokens = encrypted
-            db.commit()
-            print(f"[exchange_calendar_token] Tokens stored in database for user {clerk_user_id}")
+            save_calendar_tokens(user, tokens, db)
+            logger.debug("[exchange_calendar_token] Tokens stored in database for user %s", user.clerk_user_id)
         except ValueError as e:
             # ENCRYPTION_KEY not set - log warning but still return tokens for backward compatibility
-            print(f"Warning: Could not encrypt tokens - {e}. Tokens returned but not stored.")
+            logger.warning("Could not encrypt tokens - %s. Tokens returned but not stored.", e)
         
         return {"success": True, "tokens": tokens}
     except TimeOptiException as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
-        import traceback
-        print(f"ERROR in exchange_calendar_token: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in exchange_calendar_token: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/calendar/events")
-def get_calendar_events(request: CalendarEventsRequest):
+async def get_calendar_events(request: CalendarEventsRequest):
     """Fetch events from user's Google Calendar"""
     try:
-        print(f"Received request: {request}")
+        start = _parse_iso_datetime(request.start_date)
+        end = _parse_iso_datetime(request.end_date)
         
-        start_date_str = request.start_date.replace('Z', '+00:00') if request.start_date else None
-        end_date_str = request.end_date.replace('Z', '+00:00') if request.end_date else None
-        
-        start = datetime.fromisoformat(start_date_str) if start_date_str else None
-        end = datetime.fromisoformat(end_date_str) if end_date_str else None
-        
-        events = gcal_service.get_events(request.tokens, start, end)
-        return {"events": [e.model_dump() for e in events]}
+        events = await gcal_service.get_events_async(request.tokens, start, end)
+        return {"events": events}
     except TimeOptiException as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
-        import traceback
-        print(f"ERROR in get_calendar_events: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in get_calendar_events: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/events/today")
-def get_today_events(request: TodayEventsRequest, user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_today_events(
+    request: TodayEventsRequest,
+    user: User = Depends(get_current_db_user),
+    db: Session = Depends(get_db)
+):
     """
     Fetch today's events from user's Google Calendar.
     Requires authentication and calendar tokens.
     """
     try:
-        print(f"[/events/today] Received request with tokens: {bool(request.tokens)}")
-        
-        clerk_user_id = user_data.get("sub")
-        # Ensure user exists
-        get_or_create_user(clerk_user_id, user_data.get("email"), db)
-        
-        today = datetime.now()
-        start_of_day = today.replace(hour=0, minute=0, second=0, microsecond=0)
+        start_of_day = datetime.combine(date.today(), time.min)
         end_of_day = start_of_day + timedelta(days=1)
         
-        events = gcal_service.get_events(request.tokens, start_of_day, end_of_day)
-        return {"events": [e.model_dump() for e in events]}
+        events = await gcal_service.get_events_async(request.tokens, start_of_day, end_of_day)
+        await _store_refreshed_tokens(request.tokens, user, db)
+        return {"events": events}
         
     except TimeOptiException as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_today_events: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/commit-schedule")
@@ -133,24 +120,26 @@ def commit_schedule(request: CommitScheduleRequest, db: Session = Depends(get_db
     success_count = 0
     errors = []
     
-    for proposal in request.proposals:
-        try:
-            start_iso = f"{proposal.assigned_date}T{proposal.assigned_start_time}:00"
-            end_iso = f"{proposal.assigned_date}T{proposal.assigned_end_time}:00"
-            
-            description = f"Scheduled via TimeOpti.\nReasoning: {proposal.reasoning}"
-            
-            gcal_service.create_event(
-                request.tokens,
-                proposal.task_name,
-                start_iso,
-                end_iso,
-                description,
-                timezone=request.timezone
-            )
+    events = [
+        {
+            "summary": proposal.task_name,
+            "start_time": f"{proposal.assigned_date}T{proposal.assigned_start_time}:00",
+            "end_time": f"{proposal.assigned_date}T{proposal.assigned_end_time}:00",
+            "description": f"{EVENT_DESCRIPTION_PREFIX}{proposal.reasoning}"
+        }
+        for proposal in request.proposals
+    ]
+    
+    try:
+        results = gcal_service.create_events_bulk(request.tokens, events, timezone=request.timezone)
+    except Exception as e:
+        results = [e] * len(events)
+    
+    for proposal, result in zip(request.proposals, results):
+        if isinstance(result, Exception):
+            errors.append(f"Failed to create {proposal.task_name}: {str(result)}")
+        else:
             success_count += 1
-        except Exception as e:
-            errors.append(f"Failed to create {proposal.task_name}: {str(e)}")
     
     return {
         "success": len(errors) == 0,
@@ -5,23 +5,33 @@ This enables single-step authentication: when users sign in with Google through
 we can retrieve their Google OAuth tokens (with calendar scopes) and use them for
 calendar API access, eliminating the need for a separate "Connect Calendar" step.
 
-Uses requests library directly instead of Clerk SDK to avoid httpx version conflicts.
+Calls Clerk's Backend API directly with a shared httpx.AsyncClient instead of the
+Clerk SDK, so connections are kept alive across requests.
 """
 import os
-import requests
+import asyncio
+import logging
+import httpx
 from typing import Optional, Dict
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.core.security import get_current_user
-from app.core.encryption import encrypt_tokens
+from app.core.cache import TTLCache
 from app.models.all_models import User
+from app.services.user_service import get_or_create_user, save_calendar_tokens
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 CLERK_API_URL = "https://api.clerk.com/v1"
 
+# Short-lived cache of Clerk OAuth token responses, keyed by Clerk user id
+_clerk_oauth_cache = TTLCache(maxsize=10_000, ttl=60)
+
 
 def get_clerk_secret_key():
     """Get Clerk secret key from environment."""
@@ -31,60 +41,86 @@ def get_clerk_secret_key():
     return secret_key
 
 
-def get_or_create_user(clerk_user_id: str, email: Optional[str], db: Session) -> User:
-    """Get existing user or create a new one."""
-    user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-    if not user:
-        email = email or f"{clerk_user_id}@noemail.com"
-        user = User(clerk_user_id=clerk_user_id, email=email)
-        db.add(user)
-        try:
-            db.commit()
-            db.refresh(user)
-        except Exception as e:
-            db.rollback()
-            user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-            if not user:
-                raise e
-    return user
+_clerk_http: Optional[httpx.AsyncClient] = None
+
+
+def get_clerk_http() -> httpx.AsyncClient:
+    """Get the shared Clerk API client, creating it on first use."""
+    global _clerk_http
+    if _clerk_http is None:
+        _clerk_http = httpx.AsyncClient(
+            base_url=CLERK_API_URL,
+            headers={
+                "Authorization": f"Bearer {get_clerk_secret_key()}",
+                "Content-Type": "application/json"
+            },
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=50)
+        )
+    return _clerk_http
+
+
+async def close_clerk_http():
+    """Close the shared Clerk API client (called on application shutdown)."""
+    global _clerk_http
+    if _clerk_http is not None:
+        await _clerk_http.aclose()
+        _clerk_http = None
 
 
-def fetch_google_oauth_from_clerk(user_id: str) -> Optional[Dict]:
+async def fetch_google_oauth_from_clerk(user_id: str) -> Optional[Dict]:
     """
     Fetch Google OAuth access token from Clerk API.
     
     Uses Clerk's Backend API: GET /users/{user_id}/oauth_access_tokens/oauth_google
+    Successful responses are cached for 60 seconds per user.
     """
+    cached_token = _clerk_oauth_cache.get(user_id)
+    if cached_token is not None:
+        return cached_token
+    
     try:
-        secret_key = get_clerk_secret_key()
-        
-        response = requests.get(
-            f"{CLERK_API_URL}/users/{user_id}/oauth_access_tokens/oauth_google",
-            headers={
-                "Authorization": f"Bearer {secret_key}",
-                "Content-Type": "application/json"
-            },
-            timeout=10
+        response = await get_clerk_http().get(
+            f"/users/{user_id}/oauth_access_tokens/oauth_google"
         )
         
         if response.status_code == 200:
             data = response.json()
             if data and len(data) > 0:
+                _clerk_oauth_cache.set(user_id, data[0])
                 return data[0]  # Return first token
         elif response.status_code == 404:
-            print(f"[Clerk API] No Google OAuth token found for user {user_id}")
+            logger.info("[Clerk API] No Google OAuth token found for user %s", user_id)
             return None
         else:
-            print(f"[Clerk API] Error fetching token: {response.status_code} - {response.text}")
+            logger.warning("[Clerk API] Error fetching token: %s - %s", response.status_code, response.text)
             return None
             
     except Exception as e:
-        print(f"[Clerk API] Exception: {e}")
+        logger.warning("[Clerk API] Exception: %s", e)
         return None
 
 
+def _store_clerk_tokens(clerk_user_id: str, email: Optional[str], tokens: dict, db: Session) -> None:
+    """Store Clerk-sourced tokens on the user's row (runs in a worker thread)."""
+    user = get_or_create_user(clerk_user_id, email, db)
+    save_calendar_tokens(user, tokens, db)
+
+
+def _has_calendar_tokens(clerk_user_id: str, db: Session) -> bool:
+    """Whether the user already has calendar tokens stored (runs in a worker thread)."""
+    # Read only the tokens column instead of loading the full user row
+    calendar_tokens = db.execute(
+        select(User.calendar_tokens).where(User.clerk_user_id == clerk_user_id)
+    ).scalar()
+    # End the read-only transaction so the pooled connection isn't held while
+    # the caller awaits Clerk; the session itself stays with get_db
+    db.rollback()
+    return bool(calendar_tokens)
+
+
 @router.get("/google-token")
-def fetch_google_token_from_clerk(
+async def fetch_google_token_from_clerk(
     user_data: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -105,7 +141,7 @@ def fetch_google_token_from_clerk(
     
     try:
         # Fetch OAuth token from Clerk
-        token_data = fetch_google_oauth_from_clerk(clerk_user_id)
+        token_data = await fetch_google_oauth_from_clerk(clerk_user_id)
         
         if not token_data:
             return {
@@ -133,14 +169,11 @@ def fetch_google_token_from_clerk(
             "source": "clerk"
         }
         
-        # Store encrypted tokens in user's record
-        user = get_or_create_user(clerk_user_id, user_data.get("email"), db)
-        
+        # Store encrypted tokens in user's record; the database work runs in a
+        # worker thread so it doesn't block the event loop
         try:
-            encrypted = encrypt_tokens(tokens)
-            user.calendar_tokens = encrypted
-            db.commit()
-            print(f"[fetch_google_token_from_clerk] Tokens stored for user {clerk_user_id}")
+            await asyncio.to_thread(_store_clerk_tokens, clerk_user_id, user_data.get("email"), tokens, db)
+            logger.debug("[fetch_google_token_from_clerk] Tokens stored for user %s", clerk_user_id)
         except ValueError as e:
             raise HTTPException(status_code=500, detail=str(e))
         
@@ -154,9 +187,7 @@ def fetch_google_token_from_clerk(
         }
         
     except Exception as e:
-        print(f"Error fetching Google token from Clerk: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fetching Google token from Clerk: %s", e)
         
         return {
             "success": False,
@@ -166,7 +197,7 @@ def fetch_google_token_from_clerk(
 
 
 @router.get("/check-google-connection")
-def check_google_connection(
+async def check_google_connection(
     user_data: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -177,9 +208,7 @@ def check_google_connection(
     clerk_user_id = user_data.get("sub")
     
     # Check if user already has calendar tokens stored
-    user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-    
-    if user and user.calendar_tokens:
+    if await asyncio.to_thread(_has_calendar_tokens, clerk_user_id, db):
         return {
             "has_google_sso": True,
             "calendar_connected": True,
@@ -188,7 +217,7 @@ def check_google_connection(
     
     # Check if user has Google OAuth through Clerk
     try:
-        token_data = fetch_google_oauth_from_clerk(clerk_user_id)
+        token_data = await fetch_google_oauth_from_clerk(clerk_user_id)
         has_google = token_data is not None
         
         return {
@@ -197,7 +226,7 @@ def check_google_connection(
             "needs_connect": not has_google
         }
     except Exception as e:
-        print(f"Error checking Google connection: {e}")
+        logger.warning("Error checking Google connection: %s", e)
         return {
             "has_google_sso": False,
             "calendar_connected": False,
@@ -1,12 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.core.security import get_current_user
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from app.services.user_service import get_current_user_id
+from app.core.cache import TTLCache
 from app.core.utils import calculate_cost
 from app.core.exceptions import TimeOptiException, CalendarError, OptimizationError
-from app.services.ai_service import AIService
-from app.services.matching_service import TaskMatcher
-from app.services.google_calendar_service import GoogleCalendarService
+from app.services.ai_service import AIService, get_ai_service
+from app.services.matching_service import TaskMatcher, get_task_matcher
+from app.services.google_calendar_service import gcal_service
 from app.services.free_time_service import calculate_free_slots
 from app.schemas.validators import OptimizationValidator
 from app.schemas.optimization import (
@@ -15,49 +15,64 @@ from app.schemas.optimization import (
     GapRequest, 
     PriorityRequest, 
     AgendaRequest, 
-    AnalyzeRequest
+    AnalyzeRequest,
+    ScheduledTaskProposal
 )
-from app.models.all_models import User, AILog
+from app.services.ai_log_service import log_ai_call
+from app.schemas.common import Event, Gap, FreeSlot
+from app.schemas.task import Task
+import hashlib
+import logging
+import orjson
 import time
-from datetime import datetime, timedelta
+import uuid
+from datetime import date, datetime, timedelta
+from typing import List
+from pydantic import TypeAdapter
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-ai_service = AIService()
-task_matcher = TaskMatcher()
-gcal_service = GoogleCalendarService()
+# Serialize whole lists in one pass instead of a model_dump() per item.
+# Dumps use mode="json" so the results can go straight to ORJSONResponse
+# without another jsonable_encoder pass.
+_GAP_LIST_ADAPTER = TypeAdapter(List[Gap])
+_EVENT_LIST_ADAPTER = TypeAdapter(List[Event])
+_TASK_LIST_ADAPTER = TypeAdapter(List[Task])
+_FREE_SLOT_LIST_ADAPTER = TypeAdapter(List[FreeSlot])
+_PROPOSAL_LIST_ADAPTER = TypeAdapter(List[ScheduledTaskProposal])
 
-# Helper function (duplicated for now)
-def get_or_create_user(clerk_user_id: str, email: str, db: Session) -> User:
-    user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-    if not user:
-        email = email or f"{clerk_user_id}@noemail.com"
-        user = User(clerk_user_id=clerk_user_id, email=email)
-        db.add(user)
-        try:
-            db.commit()
-            db.refresh(user)
-        except Exception as e:
-            db.rollback()
-            user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-            if not user:
-                raise e
-    return user
+# Results of the analysis endpoints that depend only on the request body
+ANALYSIS_CACHE_TTL = 3600
+_analysis_cache = TTLCache(maxsize=1024, ttl=ANALYSIS_CACHE_TTL)
+
+
+def _analysis_cache_key(endpoint: str, request_data: dict) -> tuple:
+    """Key a request body (as dumped for the AI log) by everything but bypass_cache."""
+    body = {key: value for key, value in request_data.items() if key != "bypass_cache"}
+    return endpoint, hashlib.sha256(orjson.dumps(body, option=orjson.OPT_SORT_KEYS)).hexdigest()
 
 @router.post("/smart-optimize")
-def smart_optimize(request: SmartOptimizeRequest, db: Session = Depends(get_db)):
+async def smart_optimize(
+    request: SmartOptimizeRequest,
+    background_tasks: BackgroundTasks,
+    ai_service: AIService = Depends(get_ai_service),
+    task_matcher: TaskMatcher = Depends(get_task_matcher)
+):
     """Smart task optimization using calendar integration and matching algorithm."""
     start_time = time.time()
     error = None
     result = None
+    # Dumped once for both validation and the AI log
+    request_dict = request.model_dump()
     
     try:
-        request_dict = request.model_dump()
         OptimizationValidator.validate_optimization_request(request_dict)
         
         try:
             if request.calendar_tokens:
-                events = gcal_service.get_today_events(request.calendar_tokens)
+                events = await gcal_service.get_today_events_async(request.calendar_tokens)
             elif request.events:
                 events = request.events
             else:
@@ -76,14 +91,14 @@ def smart_optimize(request: SmartOptimizeRequest, db: Session = Depends(get_db))
             raise OptimizationError(f"Failed to match tasks to gaps: {str(e)}")
         
         result = {
-            "schedule": schedule.model_dump(),
-            "gaps_found": [g.model_dump() for g in gaps],
-            "events": [e.model_dump() for e in events]
+            "schedule": schedule.model_dump(mode="json"),
+            "gaps_found": _GAP_LIST_ADAPTER.dump_python(gaps, mode="json"),
+            "events": _EVENT_LIST_ADAPTER.dump_python(events, mode="json")
         }
         if not schedule.success:
             result["warning"] = "Some tasks could not be scheduled."
         
-        return result
+        return ORJSONResponse(result)
         
     except TimeOptiException as e:
         error = e.message
@@ -94,19 +109,23 @@ def smart_optimize(request: SmartOptimizeRequest, db: Session = Depends(get_db))
     
     finally:
         duration_ms = int((time.time() - start_time) * 1000)
-        log = AILog(
+        log_ai_call(
+            background_tasks,
             user_id=None,
             endpoint="/smart-optimize",
-            request_data=request.model_dump(),
+            request_data=request_dict,
             response_data=result,
             duration_ms=duration_ms,
             error=error
         )
-        db.add(log)
-        db.commit()
 
 @router.post("/smart-optimize-natural")
-def smart_optimize_natural(request: NaturalOptimizeRequest, db: Session = Depends(get_db)):
+async def smart_optimize_natural(
+    request: NaturalOptimizeRequest,
+    background_tasks: BackgroundTasks,
+    ai_service: AIService = Depends(get_ai_service),
+    task_matcher: TaskMatcher = Depends(get_task_matcher)
+):
     """Smart optimization from natural language input."""
     start_time = time.time()
     error = None
@@ -117,7 +136,7 @@ def smart_optimize_natural(request: NaturalOptimizeRequest, db: Session = Depend
         
         usage_data = {}
         try:
-            parsed_tasks, parse_usage = ai_service.parse_natural_language_to_tasks(
+            parsed_tasks, parse_usage = await ai_service.parse_natural_language_to_tasks_async(
                 request.natural_input,
                 detected_scope
             )
@@ -140,14 +159,14 @@ def smart_optimize_natural(request: NaturalOptimizeRequest, db: Session = Depend
             raise OptimizationError(f"Failed to match tasks to gaps: {str(e)}")
         
         result = {
-            "schedule": schedule.model_dump(),
-            "gaps_found": [g.model_dump() for g in gaps],
-            "events": [e.model_dump() for e in events],
-            "parsed_tasks": [t.model_dump() for t in parsed_tasks],
+            "schedule": schedule.model_dump(mode="json"),
+            "gaps_found": _GAP_LIST_ADAPTER.dump_python(gaps, mode="json"),
+            "events": _EVENT_LIST_ADAPTER.dump_python(events, mode="json"),
+            "parsed_tasks": _TASK_LIST_ADAPTER.dump_python(parsed_tasks, mode="json"),
             "usage": usage_data
         }
         
-        return result
+        return ORJSONResponse(result)
         
     except TimeOptiException as e:
         error = e.message
@@ -174,7 +193,8 @@ def smart_optimize_natural(request: NaturalOptimizeRequest, db: Session = Depend
                     )
                     model_used = usage.get("model", model_used)
 
-        log = AILog(
+        log_ai_call(
+            background_tasks,
             user_id=None,
             endpoint="/smart-optimize-natural",
             request_data=request.model_dump(),
@@ -185,17 +205,15 @@ def smart_optimize_natural(request: NaturalOptimizeRequest, db: Session = Depend
             model=model_used,
             cost=total_cost
         )
-        db.add(log)
-        db.commit()
 
 @router.post("/optimize")
-def optimize_agenda(request: AgendaRequest, db: Session = Depends(get_db)):
+async def optimize_agenda(request: AgendaRequest, background_tasks: BackgroundTasks, ai_service: AIService = Depends(get_ai_service)):
     start_time = time.time()
     error = None
     result = None
     
     try:
-        result, usage = ai_service.optimize_agenda(request)
+        result, usage = await ai_service.optimize_agenda_async(request)
         return {"optimized_agenda": result, "usage": usage}
     except Exception as e:
         error = str(e)
@@ -216,7 +234,8 @@ def optimize_agenda(request: AgendaRequest, db: Session = Depends(get_db)):
                 usage.get("completion_tokens", 0)
             )
             
-        log = AILog(
+        log_ai_call(
+            background_tasks,
             user_id=None,
             endpoint="/optimize",
             request_data=request.model_dump(),
@@ -227,44 +246,62 @@ def optimize_agenda(request: AgendaRequest, db: Session = Depends(get_db)):
             model=model,
             cost=cost
         )
-        db.add(log)
-        db.commit()
 
 @router.post("/analyze/gaps")
-def analyze_gaps(request: GapRequest, db: Session = Depends(get_db)):
+def analyze_gaps(request: GapRequest, background_tasks: BackgroundTasks, ai_service: AIService = Depends(get_ai_service)):
     start_time = time.time()
     error = None
     result = None
+    # Dumped once for both the cache key and the AI log
+    request_data = request.model_dump(mode="json")
     
     try:
+        cache_key = _analysis_cache_key("/analyze/gaps", request_data)
+        cached = None if request.bypass_cache else _analysis_cache.get(cache_key)
+        if cached is not None:
+            result = {**cached, "cached": True}
+            return ORJSONResponse(result)
+        
         gaps = ai_service.analyze_calendar_gaps(request.events, request.start_window, request.end_window)
-        result = {"gaps": [gap.dict() for gap in gaps]}
-        return result
+        result = {"gaps": _GAP_LIST_ADAPTER.dump_python(gaps, mode="json")}
+        _analysis_cache.set(cache_key, result)
+        return ORJSONResponse(result)
     except Exception as e:
         error = str(e)
         raise HTTPException(status_code=500, detail=error)
     finally:
         duration_ms = int((time.time() - start_time) * 1000)
-        log = AILog(
+        log_ai_call(
+            background_tasks,
             user_id=None,
             endpoint="/analyze/gaps",
-            request_data=request.model_dump(),
+            request_data=request_data,
             response_data=result,
             duration_ms=duration_ms,
             error=error
         )
-        db.add(log)
-        db.commit()
 
 @router.post("/analyze/priorities")
-def analyze_priorities(request: PriorityRequest, db: Session = Depends(get_db)):
+async def analyze_priorities(request: PriorityRequest, background_tasks: BackgroundTasks, ai_service: AIService = Depends(get_ai_service)):
     start_time = time.time()
     error = None
     result = None
+    # Dumped once for both the cache key and the AI log
+    request_data = request.model_dump(mode="json")
     
     try:
-        priorities, usage = ai_service.get_priority_tasks(request.tasks)
+        cache_key = _analysis_cache_key("/analyze/priorities", request_data)
+        cached = None if request.bypass_cache else _analysis_cache.get(cache_key)
+        if cached is not None:
+            # No LLM call was made, so nothing is billed for this request
+            result = {**cached, "cached": True}
+            return result
+        
+        priorities, usage = await ai_service.get_priority_tasks_async(request.tasks)
         result = {"priorities": priorities, "usage": usage}
+        # An empty usage means the LLM call failed and priorities is a fallback message
+        if usage:
+            _analysis_cache.set(cache_key, result)
         return result
     except Exception as e:
         error = str(e)
@@ -285,10 +322,11 @@ def analyze_priorities(request: PriorityRequest, db: Session = Depends(get_db)):
                 usage.get("completion_tokens", 0)
             )
 
-        log = AILog(
+        log_ai_call(
+            background_tasks,
             user_id=None,
             endpoint="/analyze/priorities",
-            request_data=request.model_dump(),
+            request_data=request_data,
             response_data=result,
             duration_ms=duration_ms,
             error=error,
@@ -296,11 +334,14 @@ def analyze_priorities(request: PriorityRequest, db: Session = Depends(get_db)):
             model=model,
             cost=cost
         )
-        db.add(log)
-        db.commit()
 
 @router.post("/analyze")
-def analyze_schedule(request: AnalyzeRequest, user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+async def analyze_schedule(
+    request: AnalyzeRequest,
+    background_tasks: BackgroundTasks,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    ai_service: AIService = Depends(get_ai_service)
+):
     """
     Analyze natural language input and propose a schedule based on free time.
     """
@@ -309,12 +350,11 @@ def analyze_schedule(request: AnalyzeRequest, user_data: dict = Depends(get_curr
     result = None
     
     try:
-        clerk_user_id = user_data.get("sub")
-        user = get_or_create_user(clerk_user_id, user_data.get("email"), db)
-        
         if request.target_date:
             try:
-                target_date = datetime.strptime(request.target_date, "%Y-%m-%d")
+                # C-level ISO parser instead of strptime for the fixed YYYY-MM-DD format
+                day = date.fromisoformat(request.target_date)
+                target_date = datetime(day.year, day.month, day.day)
             except ValueError:
                 target_date = datetime.now()
         else:
@@ -325,35 +365,32 @@ def analyze_schedule(request: AnalyzeRequest, user_data: dict = Depends(get_curr
         warning = None
         
         if request.tokens:
+            start_of_day = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
+            end_of_day = start_of_day + timedelta(days=1)
             try:
-                start_of_day = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                end_of_day = start_of_day + timedelta(days=1)
-                events_list = gcal_service.get_events(request.tokens, start_of_day, end_of_day)
-                events = [e.model_dump() for e in events_list]
+                events_list = await gcal_service.get_events_async(request.tokens, start_of_day, end_of_day)
+                events = _EVENT_LIST_ADAPTER.dump_python(events_list, mode="json")
             except Exception as e:
                 warning = f"Could not fetch calendar events: {str(e)}"
-                print(f"Warning: {warning}")
+                logger.warning(warning)
         else:
             warning = "No calendar tokens provided. Planning without existing events."
-            
+        
         # Add existing scheduled tasks to events to prevent overlap
         if request.existing_tasks:
-            print(f"Adding {len(request.existing_tasks)} existing tasks to busy slots")
-            for task in request.existing_tasks:
-                # Task from frontend has assigned_start_time (HH:MM) and assigned_end_time (HH:MM)
-                # We need to convert to ISO format or whatever calculate_free_slots expects
-                # calculate_free_slots handles Event objects or dicts with start_time/end_time
-                
-                # Construct full ISO string for the target date
-                start_iso = f"{target_date_str}T{task.get('assigned_start_time')}:00"
-                end_iso = f"{target_date_str}T{task.get('assigned_end_time')}:00"
-                
-                events.append({
+            logger.debug("Adding %d existing tasks to busy slots", len(request.existing_tasks))
+            # Tasks from the frontend carry HH:MM times; calculate_free_slots
+            # takes dicts with full ISO start_time/end_time on the target date
+            day = target_date_str
+            events.extend(
+                {
                     "title": task.get('task_name', 'Existing Task'),
-                    "start_time": start_iso,
-                    "end_time": end_iso,
+                    "start_time": f"{day}T{task['assigned_start_time']}:00",
+                    "end_time": f"{day}T{task['assigned_end_time']}:00",
                     "description": "Already scheduled task"
-                })
+                }
+                for task in request.existing_tasks
+            )
         
         free_slots = calculate_free_slots(
             events, 
@@ -364,17 +401,17 @@ def analyze_schedule(request: AnalyzeRequest, user_data: dict = Depends(get_curr
             start_from_now=request.start_from_now
         )
         
-        proposals_data, usage = ai_service.llm_assign_tasks_to_slots(
+        proposals_data, usage = await ai_service.llm_assign_tasks_to_slots_async(
             request.natural_input,
             free_slots,
             target_date_str,
             request.timezone
         )
         
-        free_slots_response = [s.model_dump() if hasattr(s, 'model_dump') else s.dict() if hasattr(s, 'dict') else {"id": s.id, "start": s.start, "end": s.end, "duration_minutes": s.duration_minutes} for s in free_slots]
+        free_slots_response = _FREE_SLOT_LIST_ADAPTER.dump_python(free_slots, mode="json")
         
         result = {
-            "proposals": proposals_data.get("proposals", []),
+            "proposals": _PROPOSAL_LIST_ADAPTER.dump_python(proposals_data["proposals"], mode="json"),
             "free_slots": free_slots_response,
             "events": events,
             "target_date": target_date_str,
@@ -382,18 +419,15 @@ def analyze_schedule(request: AnalyzeRequest, user_data: dict = Depends(get_curr
             "usage": usage
         }
         
-        return result
+        return ORJSONResponse(result)
 
     except Exception as e:
         error = str(e)
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in analyze_schedule: %s", e)
         raise HTTPException(status_code=500, detail=error)
     finally:
         try:
             duration_ms = int((time.time() - start_time) * 1000)
-            user_id = user.id if 'user' in locals() and user else None
-            
             tokens_used = 0
             cost = 0.0
             model = None
@@ -407,7 +441,8 @@ def analyze_schedule(request: AnalyzeRequest, user_data: dict = Depends(get_curr
                     usage.get("completion_tokens", 0)
                 )
             
-            log = AILog(
+            log_ai_call(
+                background_tasks,
                 user_id=user_id,
                 endpoint="/analyze",
                 request_data=request.model_dump() if 'request' in locals() else {},
@@ -418,8 +453,5 @@ def analyze_schedule(request: AnalyzeRequest, user_data: dict = Depends(get_curr
                 model=model,
                 cost=cost
             )
-            db.add(log)
-            db.commit()
         except Exception as log_error:
-            db.rollback()
-            print(f"Failed to log request: {log_error}")
+            logger.error("Failed to log request: %s", log_error)
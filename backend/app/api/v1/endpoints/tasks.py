@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import insert, or_, select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.session import get_db
-from app.core.security import get_current_user
-from app.models.all_models import Task, ScheduledTask, User
+from app.services.user_service import get_current_user_id
+from app.models.all_models import Task, ScheduledTask
 from pydantic import BaseModel
+import re
 import uuid
 
 router = APIRouter()
 
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+
 # --- Pydantic Models ---
 
 class TaskCreate(BaseModel):
@@ -49,32 +53,21 @@ class ScheduledTaskResponse(ScheduledTaskCreate):
     class Config:
         from_attributes = True
 
-# --- Helper ---
-def get_user(db: Session, user_data: dict) -> User:
-    clerk_id = user_data.get("sub")
-    user = db.query(User).filter(User.clerk_user_id == clerk_id).first()
-    if not user:
-        # Auto-create for now if missing (should be handled by auth/webhook)
-        email = user_data.get("email", f"{clerk_id}@noemail.com")
-        user = User(clerk_user_id=clerk_id, email=email)
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    return user
-
 # --- Tasks Endpoints ---
 
-@router.get("/tasks", response_model=dict)
-def get_tasks(user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = get_user(db, user_data)
-    tasks = db.query(Task).filter(Task.user_id == user.id).all()
-    return {"tasks": tasks}
+@router.get("/tasks", response_model=dict[str, List[TaskResponse]])
+def get_tasks(user_id: uuid.UUID = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    # Plain column rows; read-only listings don't need mapped objects
+    rows = db.execute(
+        select(Task.id, Task.title, Task.duration_minutes, Task.priority, Task.deadline)
+        .where(Task.user_id == user_id)
+    ).mappings().all()
+    return {"tasks": rows}
 
 @router.post("/tasks", response_model=TaskResponse)
-def create_task(task_in: TaskCreate, user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = get_user(db, user_data)
+def create_task(task_in: TaskCreate, user_id: uuid.UUID = Depends(get_current_user_id), db: Session = Depends(get_db)):
     task = Task(
-        user_id=user.id,
+        user_id=user_id,
         title=task_in.title,
         duration_minutes=task_in.duration_minutes,
         priority=task_in.priority,
@@ -86,16 +79,14 @@ def create_task(task_in: TaskCreate, user_data: dict = Depends(get_current_user)
     return task
 
 @router.delete("/tasks/all")
-def delete_all_tasks(user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = get_user(db, user_data)
-    count = db.query(Task).filter(Task.user_id == user.id).delete()
+def delete_all_tasks(user_id: uuid.UUID = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    count = db.query(Task).filter(Task.user_id == user_id).delete()
     db.commit()
     return {"success": True, "deleted_count": count}
 
 @router.delete("/tasks/{task_id}")
-def delete_task(task_id: str, user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = get_user(db, user_data)
-    task = db.query(Task).filter(Task.id == task_id, Task.user_id == user.id).first()
+def delete_task(task_id: str, user_id: uuid.UUID = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    task = db.query(Task).filter(Task.id == task_id, Task.user_id == user_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     db.delete(task)
@@ -104,56 +95,54 @@ def delete_task(task_id: str, user_data: dict = Depends(get_current_user), db: S
 
 # --- Scheduled Tasks Endpoints ---
 
+def find_scheduled_task(db: Session, task_id: str, user_id: uuid.UUID) -> Optional[ScheduledTask]:
+    """
+    Look up a scheduled task by its id, falling back to its slot_id.
+    Both are checked in one query; a match on the id wins.
+    """
+    query = db.query(ScheduledTask).filter(ScheduledTask.user_id == user_id)
+    # Only strings shaped like a UUID can be the primary key
+    if not _UUID_RE.fullmatch(task_id):
+        return query.filter(ScheduledTask.slot_id == task_id).first()
+    
+    task_uuid = uuid.UUID(task_id)
+    matches = query.filter(or_(ScheduledTask.id == task_uuid, ScheduledTask.slot_id == task_id)).limit(2).all()
+    return next((task for task in matches if task.id == task_uuid), matches[0] if matches else None)
+
 @router.get("/scheduled-tasks", response_model=dict[str, List[ScheduledTaskResponse]])
-def get_scheduled_tasks(user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = get_user(db, user_data)
-    tasks = db.query(ScheduledTask).filter(ScheduledTask.user_id == user.id).all()
-    return {"tasks": tasks}
+def get_scheduled_tasks(user_id: uuid.UUID = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    rows = db.execute(
+        select(
+            ScheduledTask.id,
+            ScheduledTask.task_name,
+            ScheduledTask.estimated_duration_minutes,
+            ScheduledTask.assigned_date,
+            ScheduledTask.assigned_start_time,
+            ScheduledTask.assigned_end_time,
+            ScheduledTask.slot_id,
+            ScheduledTask.reasoning,
+        ).where(ScheduledTask.user_id == user_id)
+    ).mappings().all()
+    return {"tasks": rows}
 
 @router.post("/scheduled-tasks")
-def create_scheduled_tasks(tasks_in: List[ScheduledTaskCreate], user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = get_user(db, user_data)
-    created_tasks = []
-    for t_in in tasks_in:
-        task = ScheduledTask(
-            user_id=user.id,
-            task_name=t_in.task_name,
-            estimated_duration_minutes=t_in.estimated_duration_minutes,
-            assigned_date=t_in.assigned_date,
-            assigned_start_time=t_in.assigned_start_time,
-            assigned_end_time=t_in.assigned_end_time,
-            slot_id=t_in.slot_id,
-            reasoning=t_in.reasoning
-        )
-        db.add(task)
-        created_tasks.append(task)
-    
-    db.commit()
-    return {"success": True, "count": len(created_tasks)}
+def create_scheduled_tasks(tasks_in: List[ScheduledTaskCreate], user_id: uuid.UUID = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    # One executemany INSERT instead of per-row ORM objects
+    rows = [{**t_in.model_dump(), "user_id": user_id} for t_in in tasks_in]
+    if rows:
+        db.execute(insert(ScheduledTask), rows)
+        db.commit()
+    return {"success": True, "count": len(rows)}
 
 @router.delete("/scheduled-tasks/all")
-def delete_all_scheduled_tasks(user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = get_user(db, user_data)
-    count = db.query(ScheduledTask).filter(ScheduledTask.user_id == user.id).delete()
+def delete_all_scheduled_tasks(user_id: uuid.UUID = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    count = db.query(ScheduledTask).filter(ScheduledTask.user_id == user_id).delete()
     db.commit()
     return {"success": True, "deleted_count": count}
 
 @router.delete("/scheduled-tasks/{task_id}")
-def delete_scheduled_task(task_id: str, user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = get_user(db, user_data)
-    
-    # Try to find by ID (if it's a valid UUID)
-    task = None
-    try:
-        uuid_obj = uuid.UUID(task_id)
-        task = db.query(ScheduledTask).filter(ScheduledTask.id == uuid_obj, ScheduledTask.user_id == user.id).first()
-    except ValueError:
-        pass 
-
-    # Fallback to slot_id
-    if not task:
-        task = db.query(ScheduledTask).filter(ScheduledTask.slot_id == task_id, ScheduledTask.user_id == user.id).first()
-        
+def delete_scheduled_task(task_id: str, user_id: uuid.UUID = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    task = find_scheduled_task(db, task_id, user_id)
     if not task:
         raise HTTPException(status_code=404, detail="Scheduled task not found")
         
@@ -162,21 +151,8 @@ def delete_scheduled_task(task_id: str, user_data: dict = Depends(get_current_us
     return {"success": True}
 
 @router.patch("/scheduled-tasks/{task_id}")
-def update_scheduled_task(task_id: str, updates: ScheduledTaskUpdate, user_data: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = get_user(db, user_data)
-    # Try to find by ID (if it's a valid UUID)
-    task = None
-    try:
-        # Check if task_id is a valid UUID
-        uuid_obj = uuid.UUID(task_id)
-        task = db.query(ScheduledTask).filter(ScheduledTask.id == uuid_obj, ScheduledTask.user_id == user.id).first()
-    except ValueError:
-        pass # Not a valid UUID, so it can't be the primary key
-
-    # If not found by ID, try finding by slot_id as fallback
-    if not task:
-        task = db.query(ScheduledTask).filter(ScheduledTask.slot_id == task_id, ScheduledTask.user_id == user.id).first()
-        
+def update_scheduled_task(task_id: str, updates: ScheduledTaskUpdate, user_id: uuid.UUID = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    task = find_scheduled_task(db, task_id, user_id)
     if not task:
         raise HTTPException(status_code=404, detail="Scheduled task not found")
     
@@ -0,0 +1,105 @@
+"""
+In-process caching utilities.
+
+TTLCache is a small thread-safe LRU with per-entry expiry. Expired entries are
+kept until evicted so callers can fall back to the last known value when the
+underlying source (database, external API) is unavailable.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional, Tuple, Type, Union
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value if present and not expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return default
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value even if it has expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            return default if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def pop_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key satisfies `predicate`; returns how many were removed."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def cached(
+    ttl: float,
+    key: Union[Hashable, Callable[..., Hashable]],
+    cache: Optional[TTLCache] = None,
+    stale_on: Union[Type[BaseException], Tuple[Type[BaseException], ...]] = Exception,
+):
+    """
+    Cache the result of a function for `ttl` seconds.
+
+    `key` is either a fixed cache key or a callable receiving the function's
+    arguments. If the function raises one of `stale_on` and an expired value is
+    still cached, that stale value is returned instead of propagating the error.
+    """
+    store = cache or TTLCache(maxsize=128, ttl=ttl)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if callable(key) else key
+            value = store.get(cache_key, _MISSING)
+            if value is not _MISSING:
+                return value
+            try:
+                value = func(*args, **kwargs)
+            except stale_on:
+                value = store.get_stale(cache_key, _MISSING)
+                if value is _MISSING:
+                    raise
+                return value
+            store.set(cache_key, value, ttl)
+            return value
+
+        wrapper.cache = store
+        return wrapper
+
+    return decorator
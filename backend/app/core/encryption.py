@@ -9,13 +9,21 @@ import os
 import json
 import base64
 import hashlib
+import logging
+import orjson
+from functools import lru_cache
 from typing import Dict, Optional
 from cryptography.fernet import Fernet, InvalidToken
 
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
 def _get_fernet() -> Fernet:
     """
     Get a Fernet instance using the ENCRYPTION_KEY environment variable.
     The key is hashed to ensure it's the correct length for Fernet.
+    The instance is built once and reused; a missing key is not cached, so
+    the ValueError is raised on every call until the key is set.
     """
     encryption_key = os.getenv("ENCRYPTION_KEY")
     
@@ -48,6 +56,33 @@ def encrypt_tokens(tokens: Dict) -> str:
     return encrypted.decode()
 
 
+def hash_tokens(tokens: Dict) -> str:
+    """
+    Fingerprint a token dictionary so unchanged tokens can be detected without
+    decrypting what is stored.
+    
+    Returns:
+        32-character hex digest, independent of key order
+    """
+    return hashlib.blake2b(orjson.dumps(tokens, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _decrypt_cached(encrypted_tokens: str) -> bytes:
+    """
+    Decrypt a ciphertext once and reuse the plaintext for repeat calls.
+    The plaintext stays in process memory until evicted or cleared with
+    clear_decryption_cache(). Failed decryptions raise and are not cached.
+    """
+    return _get_fernet().decrypt(encrypted_tokens.encode())
+
+
+def clear_decryption_cache() -> None:
+    """Forget cached plaintexts and the Fernet instance, e.g. after rotating ENCRYPTION_KEY."""
+    _decrypt_cached.cache_clear()
+    _get_fernet.cache_clear()
+
+
 def decrypt_tokens(encrypted_tokens: str) -> Optional[Dict]:
     """
     Decrypt an encrypted token string back to a dictionary.
@@ -62,12 +97,11 @@ def decrypt_tokens(encrypted_tokens: str) -> Optional[Dict]:
         return None
         
     try:
-        fernet = _get_fernet()
-        decrypted = fernet.decrypt(encrypted_tokens.encode())
-        return json.loads(decrypted.decode())
+        # Parsed on every call so callers each get their own dict
+        return orjson.loads(_decrypt_cached(encrypted_tokens))
     except InvalidToken:
-        print("Warning: Failed to decrypt tokens - invalid token or key mismatch")
+        logger.warning("Failed to decrypt tokens - invalid token or key mismatch")
         return None
     except Exception as e:
-        print(f"Warning: Failed to decrypt tokens - {e}")
+        logger.warning("Failed to decrypt tokens - %s", e)
         return None
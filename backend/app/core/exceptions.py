@@ -1,7 +1,7 @@
 """
 Custom exceptions and error handlers for TimeOpti
 """
-from fastapi import HTTPException, status
+from fastapi import HTTPException
 
 class TimeOptiException(Exception):
     """Base exception for TimeOpti"""
@@ -0,0 +1,38 @@
+"""
+Conditional response helpers (ETag / If-None-Match) for polled GET endpoints.
+"""
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def compute_etag(data: bytes) -> str:
+    """Strong ETag for the given bytes."""
+    return f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match header matches `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def json_response(content: Any, etag: str, cache_control: str) -> Response:
+    """JSON response carrying the given ETag and Cache-Control headers."""
+    return Response(
+        content=orjson.dumps(jsonable_encoder(content)),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
+
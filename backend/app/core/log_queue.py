@@ -0,0 +1,48 @@
+"""
+Queue-backed logging for the `app` package.
+
+Request handlers only put records on an in-memory queue; a listener thread
+writes them to stderr, so a slow or blocked stream never stalls the event loop.
+"""
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(levelname)s:     %(name)s - %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def start_log_listener() -> None:
+    """Route `app.*` loggers through a queue (called from the app lifespan)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.propagate = False
+    _listener.start()
+
+
+def stop_log_listener() -> None:
+    """Write any queued records and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+
+    listener, _listener = _listener, None
+    app_logger = logging.getLogger("app")
+    for handler in [h for h in app_logger.handlers if isinstance(h, QueueHandler)]:
+        app_logger.removeHandler(handler)
+    app_logger.propagate = True
+    listener.stop()
@@ -1,51 +1,104 @@
 import os
+import time
+import hashlib
+import logging
+import threading
 import jwt
 import requests
+from requests.adapters import HTTPAdapter
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from app.core.cache import TTLCache
+from app.core.exceptions import AuthenticationError, TimeOptiException, raise_http_exception
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 CLERK_ISSUER = os.getenv("CLERK_ISSUER")
 JWKS_URL = f"{CLERK_ISSUER}/.well-known/jwks.json"
 
+# Clerk's signing keys change rarely, so the key set is reused for this long
+JWKS_CACHE_TTL = 600
+# An unknown kid forces a refetch (key rotation), but at most this often so
+# forged kids can't turn every request into a call to Clerk
+JWKS_MIN_REFRESH_INTERVAL = 30
+# Verified tokens are reused until this many seconds before they expire
+TOKEN_EXPIRY_MARGIN = 5
+# ...and never for longer than this, so a key Clerk stops publishing isn't
+# trusted for long
+VERIFIED_TOKEN_MAX_TTL = 300
+
 security = HTTPBearer()
 
-class AuthError(Exception):
-    def __init__(self, error, status_code=401):
-        self.error = error
-        self.status_code = status_code
+# Keep-alive connections to Clerk for JWKS refetches
+_http_session = requests.Session()
+_http_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
 
 def get_jwks():
     try:
-        response = requests.get(JWKS_URL)
+        response = _http_session.get(JWKS_URL, timeout=5)
         response.raise_for_status()
         return response.json()
     except Exception as e:
-        print(f"Error fetching JWKS: {e}")
-        raise AuthError("Internal server error", 500)
+        logger.error("Error fetching JWKS: %s", e)
+        raise TimeOptiException("Internal server error", 500)
+
+
+_jwks_lock = threading.Lock()
+# Public keys parsed from the JWKS, by kid, so from_jwk runs once per key
+_public_keys: dict = {}
+_jwks_fetched_at = float("-inf")
+
+
+def get_public_key(kid: str):
+    """
+    Public key for the given kid from the cached key set, or None if Clerk
+    doesn't publish it. The set is refetched when older than JWKS_CACHE_TTL, or
+    when the kid is unknown and the last fetch is older than JWKS_MIN_REFRESH_INTERVAL.
+    """
+    global _public_keys, _jwks_fetched_at
+    
+    # Dependencies run in the threadpool, so one thread refetches at a time
+    with _jwks_lock:
+        age = time.monotonic() - _jwks_fetched_at
+        if age < JWKS_CACHE_TTL and (kid in _public_keys or age < JWKS_MIN_REFRESH_INTERVAL):
+            return _public_keys.get(kid)
+        
+        jwks = get_jwks()
+        _public_keys = {
+            key["kid"]: jwt.algorithms.RSAAlgorithm.from_jwk(key)
+            for key in jwks["keys"]
+            if key.get("kty") == "RSA"
+        }
+        _jwks_fetched_at = time.monotonic()
+        return _public_keys.get(kid)
+
+# Payloads of tokens that passed verification, by token digest
+_verified_tokens = TTLCache(maxsize=1024, ttl=VERIFIED_TOKEN_MAX_TTL)
+
 
 def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)):
     token = credentials.credentials
+    # The same session token is sent on every request until it expires, so
+    # its signature is checked once and the payload reused
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _verified_tokens.get(cache_key)
+    if payload is not None:
+        return dict(payload)
+    
     try:
         # Get the Key ID (kid) from the token header
         header = jwt.get_unverified_header(token)
         kid = header.get("kid")
         
         if not kid:
-            raise AuthError("Invalid token header")
+            raise AuthenticationError("Invalid token header")
 
-        jwks = get_jwks()
-        public_key = None
-        
-        for key in jwks["keys"]:
-            if key["kid"] == kid:
-                public_key = jwt.algorithms.RSAAlgorithm.from_jwk(key)
-                break
-        
-        if not public_key:
-            raise AuthError("Invalid token signature")
+        public_key = get_public_key(kid)
+        if public_key is None:
+            raise AuthenticationError("Invalid token signature")
 
         payload = jwt.decode(
             token,
@@ -54,16 +107,22 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Security(security))
             audience=None, # Clerk tokens might not have audience or it's the frontend URL
             issuer=CLERK_ISSUER
         )
-        return payload
+        # Tokens without an expiry are verified every time
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(exp - time.time() - TOKEN_EXPIRY_MARGIN, VERIFIED_TOKEN_MAX_TTL)
+            if ttl > 0:
+                _verified_tokens.set(cache_key, payload, ttl=ttl)
+        return dict(payload)
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError as e:
         raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
-    except AuthError as e:
-        raise HTTPException(status_code=e.status_code, detail=e.error)
+    except TimeOptiException as e:
+        raise_http_exception(e)
     except Exception as e:
-        print(f"Auth error: {e}")
+        logger.warning("Auth error: %s", e)
         raise HTTPException(status_code=401, detail="Authentication failed")
 
 def get_current_user(payload: dict = Depends(verify_token)):
@@ -1,14 +1,64 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# USD per token (input, output), longest model name first so the most
+# specific match wins
+_RATES = {
+    "gpt-4o-mini": (0.15 / 1_000_000, 0.60 / 1_000_000),
+    "gpt-4o": (5.00 / 1_000_000, 15.00 / 1_000_000),
+}
+
+
+@lru_cache(maxsize=64)
+def _rates_for(model: str) -> Optional[Tuple[float, float]]:
+    """
+    Resolve a reported model name to its per-token rates.
+    Providers report variants such as "gpt-4o-2024-08-06" or "openai/gpt-4o",
+    so names are matched by containment once and the result is cached.
+    """
+    for name, rates in _RATES.items():
+        if name in model:
+            return rates
+    return None
+
+
 def calculate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
     """
     Calculate cost based on model and tokens.
     Pricing (approximate):
     GPT-4o: Input $5.00/1M, Output $15.00/1M
+    GPT-4o mini: Input $0.15/1M, Output $0.60/1M
     """
     if not model:
         return 0.0
-        
-    if "gpt-4o" in model:
-        input_cost = (prompt_tokens / 1_000_000) * 5.00
-        output_cost = (completion_tokens / 1_000_000) * 15.00
-        return input_cost + output_cost
-    return 0.0
+
+    rates = _rates_for(model)
+    if rates is None:
+        return 0.0
+    return prompt_tokens * rates[0] + completion_tokens * rates[1]
+
+
+# Only 1440 valid times exist and the same few recur across validators and
+# gap analysis, so results are memoized (invalid input raises and isn't cached)
+@lru_cache(maxsize=2048)
+def parse_hhmm(value: str) -> int:
+    """
+    Parse an "HH:MM" time (hour may be one digit, as strptime's %H allows)
+    into minutes since midnight. Raises ValueError for anything else.
+    """
+    hours, sep, minutes = value.partition(":")
+    if (
+        not sep
+        or not 1 <= len(hours) <= 2 or not hours.isdigit() or not hours.isascii()
+        or not 1 <= len(minutes) <= 2 or not minutes.isdigit() or not minutes.isascii()
+    ):
+        raise ValueError(f"Invalid HH:MM time: {value!r}")
+    h, m = int(hours), int(minutes)
+    if h > 23 or m > 59:
+        raise ValueError(f"Invalid HH:MM time: {value!r}")
+    return h * 60 + m
+
+
+def format_hhmm(minutes: int) -> str:
+    """Format minutes since midnight as "HH:MM"."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
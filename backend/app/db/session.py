@@ -21,7 +21,25 @@ if DATABASE_URL.startswith("sqlite"):
         connect_args={"check_same_thread": False}
     )
 else:
-    engine = create_engine(DATABASE_URL)
+    # Reuse pooled connections across requests so the TCP/TLS handshake to
+    # Postgres is paid once per connection instead of once per request.
+    # Size the pool to roughly the concurrent requests one worker serves; the
+    # total across uvicorn workers, workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW),
+    # must stay under Postgres max_connections. When running behind pgbouncer
+    # (transaction pooling), lower DB_POOL_SIZE per worker so the total stays
+    # within the bouncer's limits.
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        # Recycle before typical managed-Postgres/proxy idle timeouts
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        pool_pre_ping=True,
+        # Reuse the most recently returned connection so a few stay warm and
+        # the surplus can idle out under light load
+        pool_use_lifo=True,
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
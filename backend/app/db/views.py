@@ -0,0 +1,63 @@
+"""
+Materialized views backing read-heavy admin endpoints (PostgreSQL only).
+
+Fresh databases get the views from Base.metadata.create_all via the
+after_create hooks below; existing databases get them from the Alembic
+migration. Other dialects (SQLite in local dev) query the base tables directly.
+"""
+import asyncio
+import logging
+from sqlalchemy import DDL, event, text
+from app.db.session import engine
+from app.models.all_models import AILog
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT_STATS_VIEW = "ai_endpoint_stats"
+REFRESH_INTERVAL_SECONDS = 60
+
+CREATE_ENDPOINT_STATS_VIEW = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS {ENDPOINT_STATS_VIEW} AS
+SELECT endpoint,
+       count(id) AS count,
+       avg(duration_ms) AS avg_duration,
+       sum(cost) AS total_cost,
+       sum(tokens_used) AS total_tokens
+FROM ai_logs
+GROUP BY endpoint
+"""
+
+# A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE_ENDPOINT_STATS_INDEX = (
+    f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{ENDPOINT_STATS_VIEW}_endpoint "
+    f"ON {ENDPOINT_STATS_VIEW} (endpoint)"
+)
+
+event.listen(AILog.__table__, "after_create", DDL(CREATE_ENDPOINT_STATS_VIEW).execute_if(dialect="postgresql"))
+event.listen(AILog.__table__, "after_create", DDL(CREATE_ENDPOINT_STATS_INDEX).execute_if(dialect="postgresql"))
+
+
+def uses_materialized_views(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+def refresh_endpoint_stats() -> None:
+    """Refresh the endpoint stats view without blocking readers."""
+    with engine.begin() as conn:
+        # Only one worker refreshes at a time; the others skip this round
+        locked = conn.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:name))"),
+            {"name": ENDPOINT_STATS_VIEW}
+        ).scalar()
+        if locked:
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {ENDPOINT_STATS_VIEW}"))
+
+
+async def refresh_views_periodically(interval: int = REFRESH_INTERVAL_SECONDS) -> None:
+    """Background loop refreshing the materialized views every `interval` seconds."""
+    while True:
+        try:
+            await asyncio.to_thread(refresh_endpoint_stats)
+        except Exception as e:
+            logger.warning("Failed to refresh %s: %s", ENDPOINT_STATS_VIEW, e)
+        await asyncio.sleep(interval)
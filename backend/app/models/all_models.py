@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, JSON, Float, Uuid
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, JSON, Float, Uuid, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
@@ -12,6 +12,7 @@ class User(Base):
     email = Column(String, nullable=False)
     is_admin = Column(Boolean, default=False)
     calendar_tokens = Column(JSON, nullable=True)  # Store Google Calendar OAuth tokens
+    calendar_tokens_hash = Column(String(32), nullable=True)  # hash_tokens() of the plaintext tokens
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -26,8 +27,8 @@ class AILog(Base):
     __tablename__ = "ai_logs"
     
     id = Column(Uuid, primary_key=True, default=uuid.uuid4)
-    user_id = Column(Uuid, ForeignKey("users.id"), nullable=True)
-    endpoint = Column(String, nullable=False)  # /optimize, /analyze/gaps, etc.
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=True, index=True)
+    endpoint = Column(String, nullable=False, index=True)  # /optimize, /analyze/gaps, etc.
     request_data = Column(JSON, nullable=True)
     response_data = Column(JSON, nullable=True)
     tokens_used = Column(Integer, nullable=True)
@@ -45,7 +46,7 @@ class Recommendation(Base):
     __tablename__ = "recommendations"
     
     id = Column(Uuid, primary_key=True, default=uuid.uuid4)
-    user_id = Column(Uuid, ForeignKey("users.id"), nullable=True)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=True, index=True)
     log_id = Column(Uuid, ForeignKey("ai_logs.id"), nullable=True)
     recommendation_text = Column(Text, nullable=False)
     tasks_count = Column(Integer, default=0)
@@ -59,7 +60,7 @@ class Task(Base):
     __tablename__ = "tasks"
     
     id = Column(Uuid, primary_key=True, default=uuid.uuid4)
-    user_id = Column(Uuid, ForeignKey("users.id"), nullable=True)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=True, index=True)
     title = Column(String, nullable=False)
     duration_minutes = Column(Integer, nullable=False)
     priority = Column(String, nullable=False, default='medium')  # 'high', 'medium', 'low'
@@ -87,3 +88,9 @@ class ScheduledTask(Base):
     
     # Relationships
     user = relationship("User", back_populates="scheduled_tasks")
+    
+    # Per-user listing by date, and the slot_id fallback lookup in PATCH/DELETE
+    __table_args__ = (
+        Index("ix_scheduled_tasks_user_id_assigned_date", "user_id", "assigned_date"),
+        Index("ix_scheduled_tasks_user_id_slot_id", "user_id", "slot_id"),
+    )
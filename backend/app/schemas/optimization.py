@@ -21,9 +21,11 @@ class GapRequest(BaseModel):
     events: List[Event]
     start_window: str
     end_window: str
+    bypass_cache: bool = False  # Recompute even if an identical request was cached
 
 class PriorityRequest(BaseModel):
     tasks: List[Task]
+    bypass_cache: bool = False
 
 class AgendaRequest(BaseModel):
     tasks: List[Task]
@@ -46,6 +48,7 @@ class ScheduledTaskProposal(BaseModel):
     assigned_date: str
     assigned_start_time: str
     assigned_end_time: str
+    slot_id: Optional[str] = None
     reasoning: Optional[str] = None
 
 class CommitScheduleRequest(BaseModel):
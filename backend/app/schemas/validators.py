@@ -1,9 +1,10 @@
 """
 Input validators for TimeOpti API
 """
-from typing import List, Optional
+from typing import List
 from datetime import datetime
 from app.core.exceptions import ValidationError
+from app.core.utils import parse_hhmm
 
 class TimeValidator:
     """Validates time-related inputs"""
@@ -12,7 +13,7 @@ class TimeValidator:
     def validate_time_format(time_str: str) -> bool:
         """Validate HH:MM format"""
         try:
-            datetime.strptime(time_str, '%H:%M')
+            parse_hhmm(time_str)
             return True
         except ValueError:
             return False
@@ -21,9 +22,7 @@ class TimeValidator:
     def validate_time_range(start: str, end: str) -> bool:
         """Validate that end time is after start time"""
         try:
-            start_dt = datetime.strptime(start, '%H:%M')
-            end_dt = datetime.strptime(end, '%H:%M')
-            return end_dt > start_dt
+            return parse_hhmm(end) > parse_hhmm(start)
         except ValueError:
             return False
     
@@ -35,7 +34,8 @@ class TimeValidator:
 class TaskValidator:
     """Validates task inputs"""
     
-    VALID_PRIORITIES = ['high', 'medium', 'low']
+    VALID_PRIORITIES = frozenset({'high', 'medium', 'low'})
+    PRIORITY_ERROR = "Task priority must be one of: high, medium, low"
     
     @staticmethod
     def validate_task(task: dict) -> None:
@@ -59,8 +59,8 @@ class TaskValidator:
         
         # Validate priority
         priority = task.get('priority', 'medium')
-        if priority not in TaskValidator.VALID_PRIORITIES:
-            errors.append(f"Task priority must be one of: {', '.join(TaskValidator.VALID_PRIORITIES)}")
+        if not isinstance(priority, str) or priority not in TaskValidator.VALID_PRIORITIES:
+            errors.append(TaskValidator.PRIORITY_ERROR)
         
         # Validate deadline if provided
         deadline = task.get('deadline')
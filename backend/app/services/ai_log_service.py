@@ -0,0 +1,174 @@
+import os
+import queue
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import orjson
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import BackgroundTasks
+from sqlalchemy import insert
+from app.db.session import SessionLocal
+from app.models.all_models import AILog
+
+logger = logging.getLogger(__name__)
+
+# Store complete request/response payloads instead of summaries (debugging only)
+AI_LOG_FULL_PAYLOAD = os.getenv("AI_LOG_FULL_PAYLOAD") == "1"
+
+# Longest string value kept verbatim in a summary
+SUMMARY_EXCERPT_LENGTH = 200
+
+# Batch writer: rows are queued by log_ai_call and inserted by a background
+# thread, up to AI_LOG_BATCH_SIZE rows per commit, waiting at most
+# AI_LOG_FLUSH_INTERVAL seconds to fill a batch. The queue is bounded so a
+# stalled database can't grow it without limit.
+AI_LOG_QUEUE_SIZE = 1000
+AI_LOG_BATCH_SIZE = 100
+AI_LOG_FLUSH_INTERVAL = 0.5
+
+# Every row carries the same keys so a batch is a single executemany
+_AI_LOG_FIELDS = (
+    "user_id", "endpoint", "request_data", "response_data", "tokens_used",
+    "duration_ms", "model", "cost", "error", "created_at",
+)
+
+_log_queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=AI_LOG_QUEUE_SIZE)
+_writer: Optional[threading.Thread] = None
+
+
+def summarize_payload(data: Any) -> Optional[dict]:
+    """
+    Compact stand-in for a request/response payload: a SHA-1 of the
+    canonical JSON, item counts (n_<key>) for list and dict values, and
+    scalars, with long strings cut to an excerpt.
+    """
+    if data is None or AI_LOG_FULL_PAYLOAD:
+        return data
+    
+    canonical = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    summary = {"sha1": hashlib.sha1(canonical).hexdigest()}
+    if not isinstance(data, dict):
+        return summary
+    
+    for key, value in data.items():
+        if isinstance(value, (list, dict)):
+            summary[f"n_{key}"] = len(value)
+        elif isinstance(value, str) and len(value) > SUMMARY_EXCERPT_LENGTH:
+            summary[key] = value[:SUMMARY_EXCERPT_LENGTH]
+        else:
+            summary[key] = value
+    return summary
+
+
+def write_ai_logs(rows: List[dict]) -> None:
+    """
+    Persist AILog rows in one INSERT using a short-lived session.
+    Request and response payloads are stored as summaries unless
+    AI_LOG_FULL_PAYLOAD=1.
+    """
+    values = []
+    for fields in rows:
+        row = {key: fields.get(key) for key in _AI_LOG_FIELDS}
+        row["request_data"] = summarize_payload(row["request_data"])
+        row["response_data"] = summarize_payload(row["response_data"])
+        row["created_at"] = row["created_at"] or datetime.utcnow()
+        values.append(row)
+    
+    db = SessionLocal()
+    try:
+        db.execute(insert(AILog), values)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to log request: %s", e)
+    finally:
+        db.close()
+
+
+def write_ai_log(**fields) -> None:
+    """Persist one AILog row (see write_ai_logs)."""
+    write_ai_logs([fields])
+
+
+def _write_ai_log_off_loop(fields: dict) -> None:
+    """
+    Write one row without holding up the event loop: on the loop it goes to
+    the default executor, and from a worker thread (sync endpoints) it is
+    written directly.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        write_ai_log(**fields)
+        return
+    loop.run_in_executor(None, lambda: write_ai_log(**fields))
+
+
+def _drain_log_queue() -> None:
+    """Writer thread: insert queued rows in batches until the None sentinel."""
+    while True:
+        row = _log_queue.get()
+        if row is None:
+            return
+        batch = [row]
+        deadline = time.monotonic() + AI_LOG_FLUSH_INTERVAL
+        stopping = False
+        while len(batch) < AI_LOG_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                row = _log_queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if row is None:
+                stopping = True
+                break
+            batch.append(row)
+        write_ai_logs(batch)
+        if stopping:
+            return
+
+
+def start_ai_log_writer() -> None:
+    """Start the batch writer thread (called from the app lifespan)."""
+    global _writer
+    if _writer is None:
+        _writer = threading.Thread(target=_drain_log_queue, name="ai-log-writer", daemon=True)
+        _writer.start()
+
+
+def stop_ai_log_writer() -> None:
+    """Write any queued rows and stop the writer thread."""
+    global _writer
+    if _writer is not None:
+        writer, _writer = _writer, None
+        _log_queue.put(None)
+        writer.join()
+
+
+def log_ai_call(background_tasks: BackgroundTasks, **fields) -> None:
+    """
+    Record an AI endpoint call without delaying the response.
+
+    The row is queued for the batch writer, stamped with the time of the call;
+    this never blocks on the queue. Without a running writer, or if its queue
+    is full, the row is written by a background task after the response is
+    sent instead. Background tasks are dropped when the endpoint raises, so
+    calls that ended in an error are then handed to a worker thread right away.
+    """
+    fields.setdefault("created_at", datetime.utcnow())
+    if _writer is not None:
+        try:
+            _log_queue.put_nowait(fields)
+            return
+        except queue.Full:
+            pass
+    
+    if fields.get("error") is not None:
+        _write_ai_log_off_loop(fields)
+    else:
+        background_tasks.add_task(write_ai_log, **fields)
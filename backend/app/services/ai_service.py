@@ -1,15 +1,65 @@
 import os
-from openai import OpenAI
-from pydantic import BaseModel
+import re
+import copy
+import asyncio
+import hashlib
+import logging
+import httpx
+import orjson
+from fastapi import Request
+from pydantic import ValidationError
+from functools import lru_cache
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from app.schemas.task import Task
-from app.schemas.common import Event, Gap
-from app.schemas.optimization import AgendaRequest
+from app.schemas.common import Event, FreeSlot, Gap
+from app.schemas.optimization import AgendaRequest, ScheduledTaskProposal
+from app.core.utils import format_hhmm, parse_hhmm
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+def _keywords_re(keywords: List[str]) -> "re.Pattern":
+    """Case-insensitive pattern matching any of `keywords` anywhere in a string."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+
+
+# Scope keywords for detect_scope_from_input (substring matches, like "weekly")
+_TOMORROW_RE = _keywords_re(['tomorrow', 'demain'])
+_WEEK_RE = _keywords_re(['this week', 'week', 'weekly', 'cette semaine', 'semaine'])
+_TODAY_RE = _keywords_re(['today', "aujourd'hui", 'ce jour'])
+
+# Completions at or below this temperature are treated as deterministic and
+# reused for identical requests (same model, messages and options)
+CACHEABLE_TEMPERATURE = 0.2
+LLM_CACHE_TTL = 300
+_llm_cache = TTLCache(maxsize=512, ttl=LLM_CACHE_TTL)
+
+
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key: str, base_url: Optional[str]):
+    """
+    Synchronous OpenAI client shared by every AIService with the same
+    credentials, so its keep-alive connection pool outlives any one service.
+    """
+    from openai import OpenAI
+    
+    return OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        )
+    )
+
 
 class AIService:
-    def __init__(self):
+    # Cap on concurrent outbound LLM requests from the async methods
+    MAX_CONCURRENT_REQUESTS = 5
+    
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         api_key = os.getenv("OPENAI_API_KEY")
         base_url = None
         
@@ -18,40 +68,145 @@ class AIService:
             if api_key:
                 base_url = "https://openrouter.ai/api/v1"
         
+        # openai is the slowest import in the app; load it here, when the
+        # lifespan builds the service, rather than when the module is imported
+        from openai import AsyncOpenAI
+        
         if not api_key:
-            print("Warning: No API Key found (OPENAI_API_KEY or OPENROUTER_API_KEY). AI features will be disabled.")
+            logger.warning("No API Key found (OPENAI_API_KEY or OPENROUTER_API_KEY). AI features will be disabled.")
             self.client = None
+            self.async_client = None
         else:
-            self.client = OpenAI(
+            self.client = _get_openai_client(api_key, base_url)
+            self.async_client = AsyncOpenAI(
                 api_key=api_key,
-                base_url=base_url
+                base_url=base_url,
+                http_client=http_client
             )
+        
+        # Created on first use so it belongs to the running event loop
+        self._semaphore = None
+        # Deterministic completions currently being requested, by cache key
+        self._completions_inflight = {}
 
-    def optimize_agenda(self, request: AgendaRequest) -> tuple[str, dict]:
-        prompt = self._build_prompt(request)
+    @staticmethod
+    def _completion_cache_key(params: dict) -> Optional[str]:
+        """Cache key for a deterministic completion request, else None."""
+        if params.get("temperature", 1.0) > CACHEABLE_TEMPERATURE:
+            return None
+        return hashlib.sha1(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    async def _request_completion(self, params: dict):
+        """Chat completion call, limited to MAX_CONCURRENT_REQUESTS in flight."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        async with self._semaphore:
+            return await self.async_client.chat.completions.create(**params)
+
+    async def _create_completion_async(self, **params):
+        """
+        Async chat completion. Deterministic requests are answered from a
+        short-lived cache when an identical one was made recently, and
+        concurrent identical ones share a single upstream call. Only the
+        caller that made the call gets its usage; the others get none.
+        """
+        key = self._completion_cache_key(params)
+        if key is None:
+            return await self._request_completion(params)
+        
+        cached = _llm_cache.get(key)
+        if cached is not None:
+            return self._without_usage(cached)
         
+        completion = self._completions_inflight.get(key)
+        if completion is not None:
+            return self._without_usage(await asyncio.shield(completion))
+        
+        completion = asyncio.ensure_future(self._request_completion(params))
+        self._completions_inflight[key] = completion
+        completion.add_done_callback(lambda done: self._completion_finished(key, done))
+        # Shielded so one cancelled caller doesn't cancel the call for the others
+        return await asyncio.shield(completion)
+
+    def _discard_completion(self, params: dict) -> None:
+        """
+        Drop the cached completion for `params`, for callers whose reply
+        didn't parse, so identical requests ask the model again.
+        """
+        key = self._completion_cache_key(params)
+        if key is not None:
+            _llm_cache.pop(key)
+
+    def _completion_finished(self, key: str, completion: asyncio.Future) -> None:
+        self._completions_inflight.pop(key, None)
+        if not completion.cancelled() and completion.exception() is None:
+            _llm_cache.set(key, completion.result())
+
+    @staticmethod
+    def _without_usage(response):
+        """Copy of a shared response with usage cleared, as nothing was billed for it."""
+        response = copy.copy(response)
+        response.usage = None
+        return response
+
+    @staticmethod
+    def _usage(response) -> dict:
+        if response.usage is None:
+            # Shared or cached completion, so nothing was billed
+            return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "model": response.model}
+        return {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens,
+            "total_tokens": response.usage.total_tokens,
+            "model": response.model
+        }
+
+    def _optimize_agenda_params(self, request: AgendaRequest) -> dict:
+        prompt = self._build_prompt(request)
+        return dict(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "You are an expert time management assistant. Organize the following tasks into an optimized schedule."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7
+        )
+
+    def optimize_agenda(self, request: AgendaRequest) -> tuple[str, dict]:
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are an expert time management assistant. Organize the following tasks into an optimized schedule."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7
-            )
-            
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-                "model": response.model
-            }
-            
-            return response.choices[0].message.content, usage
+            response = self.client.chat.completions.create(**self._optimize_agenda_params(request))
+            return response.choices[0].message.content, self._usage(response)
         except Exception as e:
-            print(f"Error calling OpenAI: {e}")
+            logger.error("Error calling OpenAI: %s", e)
             return "Failed to optimize agenda.", {}
 
+    async def optimize_agenda_async(self, request: AgendaRequest) -> tuple[str, dict]:
+        try:
+            response = await self._create_completion_async(**self._optimize_agenda_params(request))
+            return response.choices[0].message.content, self._usage(response)
+        except Exception as e:
+            logger.error("Error calling OpenAI: %s", e)
+            return "Failed to optimize agenda.", {}
+
+    @staticmethod
+    def _iso_to_hhmm(value: str) -> str:
+        """
+        Wall-clock HH:MM of an ISO datetime string (any UTC offset is ignored),
+        or the value unchanged if it can't be parsed.
+        """
+        # Calendar APIs send YYYY-MM-DDTHH:MM..., so slice the time out directly
+        if len(value) >= 16 and value[10] == 'T' and value[13] == ':':
+            hhmm = value[11:16]
+            try:
+                parse_hhmm(hhmm)
+                return hhmm
+            except ValueError:
+                pass
+        try:
+            return datetime.fromisoformat(value).strftime("%H:%M")
+        except ValueError:
+            return value
+
     def analyze_calendar_gaps(self, events: List[Event], start_window: str, end_window: str) -> List[Gap]:
         # Analyze gaps based on events
         # If events are in ISO format, extract time for simple gap analysis
@@ -59,70 +214,66 @@ class AIService:
         
         gaps = []
         
-        # For now, we'll try to extract HH:MM from ISO strings if necessary
-        # to maintain compatibility with existing logic that expects HH:MM
+        # Check the window first so a bad one doesn't cost an events pass
+        try:
+            current_time = parse_hhmm(start_window)
+            end_time = parse_hhmm(end_window)
+        except ValueError:
+            logger.error("Error parsing time window: %s - %s", start_window, end_window)
+            return gaps
         
-        processed_events = []
+        # Events become (start, end) minutes since midnight; ISO strings are
+        # reduced to their HH:MM and events with unusable times are skipped
+        intervals = []
         for event in events:
             start = event.start_time
             end = event.end_time
             
             # Try to convert ISO to HH:MM if it contains 'T'
             if 'T' in start:
-                try:
-                    dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                    start = dt.strftime("%H:%M")
-                except:
-                    pass
+                start = self._iso_to_hhmm(start)
             
             if 'T' in end:
-                try:
-                    dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
-                    end = dt.strftime("%H:%M")
-                except:
-                    pass
+                end = self._iso_to_hhmm(end)
             
-            processed_events.append(Event(title=event.title, start_time=start, end_time=end))
-
-        fmt = "%H:%M"
-        sorted_events = sorted(processed_events, key=lambda x: x.start_time)
+            try:
+                interval = (parse_hhmm(start), parse_hhmm(end))
+            except ValueError:
+                continue
+            # An event ending before it starts can't block any time
+            if interval[1] >= interval[0]:
+                intervals.append(interval)
         
-        try:
-            current_time = datetime.strptime(start_window, fmt)
-            end_time = datetime.strptime(end_window, fmt)
-
-            for event in sorted_events:
-                try:
-                    event_start = datetime.strptime(event.start_time, fmt)
-                    event_end = datetime.strptime(event.end_time, fmt)
-
-                    if event_start > current_time:
-                        duration = int((event_start - current_time).total_seconds() / 60)
-                        if duration > 0:
-                            gaps.append(Gap(
-                                start_time=current_time.strftime(fmt),
-                                end_time=event_start.strftime(fmt),
-                                duration_minutes=duration
-                            ))
-                    
-                    current_time = max(current_time, event_end)
-                except ValueError:
-                    continue # Skip invalid time formats
-
-            if current_time < end_time:
-                duration = int((end_time - current_time).total_seconds() / 60)
-                if duration > 0:
-                    gaps.append(Gap(
-                        start_time=current_time.strftime(fmt),
-                        end_time=end_time.strftime(fmt),
-                        duration_minutes=duration
-                    ))
-        except ValueError:
-            print(f"Error parsing time window: {start_window} - {end_window}")
+        # Merge overlapping events so the gap scan only sees disjoint busy blocks
+        intervals.sort()
+        busy = []
+        for event_start, event_end in intervals:
+            if busy and event_start <= busy[-1][1]:
+                busy[-1] = (busy[-1][0], max(busy[-1][1], event_end))
+            else:
+                busy.append((event_start, event_end))
+        
+        # Gaps are built from already-checked integers, so skip validation
+        for event_start, event_end in busy:
+            if event_start > current_time:
+                gaps.append(Gap.model_construct(
+                    start_time=format_hhmm(current_time),
+                    end_time=format_hhmm(event_start),
+                    duration_minutes=event_start - current_time
+                ))
+            
+            current_time = max(current_time, event_end)
+
+        if current_time < end_time:
+            gaps.append(Gap.model_construct(
+                start_time=format_hhmm(current_time),
+                end_time=format_hhmm(end_time),
+                duration_minutes=end_time - current_time
+            ))
         
         return gaps
 
-    def get_priority_tasks(self, tasks: List[Task]) -> tuple[str, dict]:
+    def _priority_tasks_params(self, tasks: List[Task]) -> dict:
         tasks_str = "\n".join([f"- {t.title} (Priority: {t.priority})" for t in tasks])
         prompt = f"""
         Analyze the following tasks and identify the top 3 highest priority tasks based on the Eisenhower Matrix.
@@ -131,27 +282,29 @@ class AIService:
         Tasks:
         {tasks_str}
         """
-        
+        return dict(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "You are a productivity expert. Prioritize tasks effectively."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7
+        )
+
+    def get_priority_tasks(self, tasks: List[Task]) -> tuple[str, dict]:
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a productivity expert. Prioritize tasks effectively."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7
-            )
-            
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-                "model": response.model
-            }
-            
-            return response.choices[0].message.content, usage
+            response = self.client.chat.completions.create(**self._priority_tasks_params(tasks))
+            return response.choices[0].message.content, self._usage(response)
+        except Exception as e:
+            logger.error("Error calling OpenAI: %s", e)
+            return "Failed to prioritize tasks.", {}
+
+    async def get_priority_tasks_async(self, tasks: List[Task]) -> tuple[str, dict]:
+        try:
+            response = await self._create_completion_async(**self._priority_tasks_params(tasks))
+            return response.choices[0].message.content, self._usage(response)
         except Exception as e:
-            print(f"Error calling OpenAI: {e}")
+            logger.error("Error calling OpenAI: %s", e)
             return "Failed to prioritize tasks.", {}
 
     def detect_scope_from_input(self, natural_input: str) -> tuple[str, str]:
@@ -159,37 +312,22 @@ class AIService:
         Detect if the user wants to optimize 'today', 'tomorrow', or 'this week' from their input.
         Returns (scope, target_date) where target_date is 'today', 'tomorrow', or 'week'
         """
-        input_lower = natural_input.lower()
-        
         # Check for tomorrow
-        tomorrow_keywords = ['tomorrow', 'demain']
-        if any(keyword in input_lower for keyword in tomorrow_keywords):
+        if _TOMORROW_RE.search(natural_input):
             return ('today', 'tomorrow')  # Use 'today' scope but for tomorrow's date
         
         # Check for explicit week indicators
-        week_keywords = ['this week', 'week', 'weekly', 'cette semaine', 'semaine']
-        if any(keyword in input_lower for keyword in week_keywords):
+        if _WEEK_RE.search(natural_input):
             return ('week', 'week')
         
         # Check for explicit today indicators
-        today_keywords = ['today', "aujourd'hui", 'ce jour']
-        if any(keyword in input_lower for keyword in today_keywords):
+        if _TODAY_RE.search(natural_input):
             return ('today', 'today')
         
         # Default to today if not specified
         return ('today', 'today')
     
-    def parse_natural_language_to_tasks(self, natural_input: str, scope: str) -> tuple[List[Task], dict]:
-        """
-        Parse natural language input into structured tasks with context awareness.
-        
-        Example: "today I want to study, have breakfast and visit friend"
-        -> [
-            Task(title="Breakfast", duration=30, priority="high", ...),
-            Task(title="Study", duration=120, priority="medium", ...),
-            Task(title="Visit friend", duration=90, priority="medium", ...)
-        ]
-        """
+    def _parse_tasks_params(self, natural_input: str, scope: str) -> dict:
         prompt = f"""
 TASK: Split the user's input into SEPARATE individual activities.
 
@@ -260,73 +398,93 @@ Output:
 CRITICAL: Count activities in input. Output MUST have same number of objects in "tasks" array.
 """
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": """You are a task extraction AI. Your ONLY job is to split activities into separate tasks.
+        return dict(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": """You are a task extraction AI. Your ONLY job is to split activities into separate tasks.
 CRITICAL RULES:
 1. Each activity = ONE separate task object
 2. "gym, dinner, games" = 3 separate objects
 3. NEVER combine multiple activities into one task
 4. Return a JSON array with one object per activity"""},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,  # Lower temperature for more deterministic output
-                response_format={"type": "json_object"}  # Force JSON output
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1,  # Lower temperature for more deterministic output
+            response_format={"type": "json_object"}  # Force JSON output
+        )
+
+    def _tasks_from_response(self, response) -> tuple[List[Task], dict]:
+        content = response.choices[0].message.content
+        logger.debug("AI Response: %s", content)
+        
+        # Parse JSON response
+        response_data = orjson.loads(content)
+        
+        # Handle both formats: {"tasks": [...]} or [...]
+        if isinstance(response_data, dict) and 'tasks' in response_data:
+            tasks_data = response_data['tasks']
+        elif isinstance(response_data, list):
+            tasks_data = response_data
+        else:
+            logger.warning("Unexpected response format: %s", response_data)
+            tasks_data = []
+        
+        logger.debug("Extracted %d tasks from AI response", len(tasks_data))
+        
+        # Convert to Task objects
+        tasks = []
+        for i, task_data in enumerate(tasks_data):
+            task = Task(
+                id=task_data.get('id', str(i+1)),
+                title=task_data['title'],
+                duration_minutes=task_data['duration_minutes'],
+                priority=task_data.get('priority', 'medium'),
+                deadline=None,  # Can be added later if needed
+                time_preference=task_data.get('time_preference'),
+                reasoning=task_data.get('reasoning', 'Optimal time based on task type')
             )
-            
-            content = response.choices[0].message.content
-            print(f"AI Response: {content}")
-            
-            # Parse JSON response
-            import json
-            response_data = json.loads(content)
-            
-            # Handle both formats: {"tasks": [...]} or [...]
-            if isinstance(response_data, dict) and 'tasks' in response_data:
-                tasks_data = response_data['tasks']
-            elif isinstance(response_data, list):
-                tasks_data = response_data
-            else:
-                print(f"Unexpected response format: {response_data}")
-                tasks_data = []
-            
-            print(f"Extracted {len(tasks_data)} tasks from AI response")
-            
-            # Convert to Task objects
-            tasks = []
-            for i, task_data in enumerate(tasks_data):
-                task = Task(
-                    id=task_data.get('id', str(i+1)),
-                    title=task_data['title'],
-                    duration_minutes=task_data['duration_minutes'],
-                    priority=task_data.get('priority', 'medium'),
-                    deadline=None,  # Can be added later if needed
-                    time_preference=task_data.get('time_preference'),
-                    reasoning=task_data.get('reasoning', 'Optimal time based on task type')
-                )
-                tasks.append(task)
-                print(f"Task {i+1}: {task.title} ({task.duration_minutes}min)")
-            
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-                "model": response.model
-            }
-            
-            return tasks, usage
-            
+            tasks.append(task)
+            logger.debug("Task %d: %s (%dmin)", i + 1, task.title, task.duration_minutes)
+        
+        return tasks, self._usage(response)
+
+    def _fallback_tasks(self, natural_input: str) -> List[Task]:
+        # Fallback: create a single generic task
+        return [Task(
+            id="1",
+            title=natural_input[:50],
+            duration_minutes=60,
+            priority="medium"
+        )]
+
+    def parse_natural_language_to_tasks(self, natural_input: str, scope: str) -> tuple[List[Task], dict]:
+        """
+        Parse natural language input into structured tasks with context awareness.
+        
+        Example: "today I want to study, have breakfast and visit friend"
+        -> [
+            Task(title="Breakfast", duration=30, priority="high", ...),
+            Task(title="Study", duration=120, priority="medium", ...),
+            Task(title="Visit friend", duration=90, priority="medium", ...)
+        ]
+        """
+        try:
+            response = self.client.chat.completions.create(**self._parse_tasks_params(natural_input, scope))
+            return self._tasks_from_response(response)
+        except Exception as e:
+            logger.error("Error parsing natural language: %s", e)
+            return self._fallback_tasks(natural_input), {}
+
+    async def parse_natural_language_to_tasks_async(self, natural_input: str, scope: str) -> tuple[List[Task], dict]:
+        """Async variant of parse_natural_language_to_tasks."""
+        params = self._parse_tasks_params(natural_input, scope)
+        try:
+            response = await self._create_completion_async(**params)
+            return self._tasks_from_response(response)
         except Exception as e:
-            print(f"Error parsing natural language: {e}")
-            # Fallback: create a single generic task
-            return [Task(
-                id="1",
-                title=natural_input[:50],
-                duration_minutes=60,
-                priority="medium"
-            )], {}
+            logger.error("Error parsing natural language: %s", e)
+            self._discard_completion(params)
+            return self._fallback_tasks(natural_input), {}
 
     def _build_prompt(self, request: AgendaRequest) -> str:
         tasks_str = "\n".join([f"- {t.title} ({t.duration_minutes}m) [{t.priority}]" for t in request.tasks])
@@ -341,23 +499,16 @@ CRITICAL RULES:
         Output a schedule with start and end times for each task.
         """
 
-    def llm_assign_tasks_to_slots(
+    def _assign_slots_params(
         self, 
         natural_input: str, 
-        free_slots: List, 
+        free_slots: List[FreeSlot], 
         target_date: str, 
-        timezone: str = "UTC"
-    ) -> tuple[dict, dict]:
-        """
-        Probabilistic layer: Use LLM to split tasks and assign them to provided free slots.
-        """
-        import json
-        
-        # Format free slots for prompt
-        slots_str = json.dumps([
-            {"id": s.id, "start": s.start, "end": s.end, "duration_minutes": s.duration_minutes} 
-            for s in free_slots
-        ])
+        timezone: str
+    ) -> dict:
+        # Format free slots for prompt; a FreeSlot's __dict__ holds exactly its
+        # fields (id, start, end, duration_minutes), so no copies are needed
+        slots_str = orjson.dumps([s.__dict__ for s in free_slots]).decode()
         
         prompt = f"""
         You are a scheduling engine.
@@ -409,31 +560,74 @@ CRITICAL RULES:
         }}
         """
         
+        return dict(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "You are a helpful scheduling assistant. Return JSON only."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1,
+            response_format={"type": "json_object"}
+        )
+
+    def _assignments_from_response(self, response) -> tuple[dict, dict, bool]:
+        """Parsed proposals, usage, and whether every proposal in the reply was valid."""
+        content = response.choices[0].message.content
+        logger.debug("[llm_assign_tasks_to_slots] Raw LLM Response: %s", content)
+        
+        data = orjson.loads(content)
+        # Keep every proposal that validates; a malformed one is dropped on its own
+        proposals = []
+        for index, proposal in enumerate(data.get("proposals") or []):
+            try:
+                proposals.append(ScheduledTaskProposal.model_validate(proposal))
+            except ValidationError as e:
+                logger.warning("Dropping invalid LLM proposal %d: %s", index, e)
+        complete = len(proposals) == len(data.get("proposals") or [])
+        data["proposals"] = proposals
+        return data, self._usage(response), complete
+
+    def llm_assign_tasks_to_slots(
+        self, 
+        natural_input: str, 
+        free_slots: List[FreeSlot], 
+        target_date: str, 
+        timezone: str = "UTC"
+    ) -> tuple[dict, dict]:
+        """
+        Probabilistic layer: Use LLM to split tasks and assign them to provided free slots.
+        """
         try:
             response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a helpful scheduling assistant. Return JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                response_format={"type": "json_object"}
+                **self._assign_slots_params(natural_input, free_slots, target_date, timezone)
             )
-            
-            content = response.choices[0].message.content
-            print(f"[llm_assign_tasks_to_slots] Raw LLM Response: {content}")
-            
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-                "model": response.model
-            }
-            
-            return json.loads(content), usage
-            
+            data, usage, _ = self._assignments_from_response(response)
+            return data, usage
+        except Exception as e:
+            logger.exception("Error in llm_assign_tasks_to_slots: %s", e)
+            return {"proposals": []}, {}
+
+    async def llm_assign_tasks_to_slots_async(
+        self, 
+        natural_input: str, 
+        free_slots: List[FreeSlot], 
+        target_date: str, 
+        timezone: str = "UTC"
+    ) -> tuple[dict, dict]:
+        """Async variant of llm_assign_tasks_to_slots."""
+        params = self._assign_slots_params(natural_input, free_slots, target_date, timezone)
+        try:
+            response = await self._create_completion_async(**params)
+            data, usage, complete = self._assignments_from_response(response)
         except Exception as e:
-            print(f"Error in llm_assign_tasks_to_slots: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in llm_assign_tasks_to_slots: %s", e)
+            self._discard_completion(params)
             return {"proposals": []}, {}
+        if not complete:
+            self._discard_completion(params)
+        return data, usage
+
+
+def get_ai_service(request: Request) -> AIService:
+    """Dependency returning the AIService built in the app lifespan."""
+    return request.app.state.ai_service
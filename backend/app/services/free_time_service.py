@@ -1,18 +1,56 @@
-from typing import List, Optional
-from pydantic import BaseModel
+import logging
+from typing import List, Tuple
 from datetime import datetime, timedelta, time
+from functools import lru_cache
 from app.schemas.common import FreeSlot
 
-class TimeInterval(BaseModel):
-    start: datetime
-    end: datetime
+logger = logging.getLogger(__name__)
 
+# Interval arithmetic runs on integer microsecond offsets from midnight;
+# datetimes only appear while parsing the inputs
+_ONE_USEC = timedelta(microseconds=1)
+_USEC_PER_MINUTE = 60_000_000
+
+# strptime dominates the per-event cost, and there are only 1440 distinct HH:MM values
+@lru_cache(maxsize=2048)
 def parse_time(t_str: str) -> time:
     return datetime.strptime(t_str, "%H:%M").time()
 
 def time_to_minutes(t: time) -> int:
     return t.hour * 60 + t.minute
 
+def _parse_wall_clock(value: str) -> datetime:
+    """
+    Parse an ISO datetime and drop any UTC offset, keeping the wall-clock time.
+    datetime.combine of the naive date and time is several times cheaper
+    than replace(tzinfo=None) on an aware datetime.
+    """
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        return dt
+    return datetime.combine(dt.date(), dt.time())
+
+def _free_intervals(busy: List[Tuple[int, int]], start: int, end: int, min_slot: int) -> List[Tuple[int, int]]:
+    """
+    Merge the busy (start, end) offsets and return the gaps between them
+    inside [start, end] that are at least `min_slot` long.
+    """
+    busy.sort()
+    free = []
+    cursor = start
+    for busy_start, busy_end in busy:
+        if cursor < busy_start and busy_start - cursor >= min_slot:
+            free.append((cursor, busy_start))
+        if busy_end > cursor:
+            cursor = busy_end
+    if cursor < end and end - cursor >= min_slot:
+        free.append((cursor, end))
+    return free
+
+def _format_offset(offset: int) -> str:
+    minutes = offset // _USEC_PER_MINUTE
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
 def calculate_free_slots(
     events: List[dict],
     target_date: datetime,
@@ -50,8 +88,11 @@ def calculate_free_slots(
             if start_dt >= end_dt:
                 return []
     
-    # 2. Collect all busy intervals (events + sleep)
-    busy_intervals: List[TimeInterval] = []
+    # 2. Collect all busy intervals (events + sleep) as offsets from midnight
+    def offset(dt: datetime) -> int:
+        return (dt - base_date) // _ONE_USEC
+    
+    busy_intervals: List[Tuple[int, int]] = []
     
     # Add Sleep Intervals
     # Sleep is typically overnight, so we might have:
@@ -64,20 +105,17 @@ def calculate_free_slots(
     # Check if sleep wraps around midnight
     if s_start > s_end:
         # Evening sleep (e.g. 23:00 to 23:59)
-        busy_intervals.append(TimeInterval(
-            start=datetime.combine(base_date, s_start),
-            end=datetime.combine(base_date, time(23, 59, 59))
+        busy_intervals.append((
+            offset(datetime.combine(base_date, s_start)),
+            offset(datetime.combine(base_date, time(23, 59, 59)))
         ))
         # Morning sleep (e.g. 00:00 to 07:00)
-        busy_intervals.append(TimeInterval(
-            start=datetime.combine(base_date, time(0, 0)),
-            end=datetime.combine(base_date, s_end)
-        ))
+        busy_intervals.append((0, offset(datetime.combine(base_date, s_end))))
     else:
         # Sleep is within the day (unlikely for sleep, but possible for other blocks)
-        busy_intervals.append(TimeInterval(
-            start=datetime.combine(base_date, s_start),
-            end=datetime.combine(base_date, s_end)
+        busy_intervals.append((
+            offset(datetime.combine(base_date, s_start)),
+            offset(datetime.combine(base_date, s_end))
         ))
 
     # Add Events
@@ -92,92 +130,41 @@ def calculate_free_slots(
                 
             # Parse start
             if 'T' in e_start:
-                dt_start = datetime.fromisoformat(e_start.replace('Z', '+00:00')).replace(tzinfo=None)
+                dt_start = _parse_wall_clock(e_start)
             else:
                 dt_start = datetime.combine(base_date, parse_time(e_start))
                 
             # Parse end
             if 'T' in e_end:
-                dt_end = datetime.fromisoformat(e_end.replace('Z', '+00:00')).replace(tzinfo=None)
+                dt_end = _parse_wall_clock(e_end)
             else:
                 dt_end = datetime.combine(base_date, parse_time(e_end))
             
-            # Normalize to target day only
-            # If event is outside target day, clamp or ignore
-            
-            # Clamp to day start/end
+            # Clamp to day start/end; events outside the target day drop out
             eff_start = max(start_dt, dt_start)
             eff_end = min(end_dt, dt_end)
             
             if eff_start < eff_end:
-                busy_intervals.append(TimeInterval(start=eff_start, end=eff_end))
+                busy_intervals.append((offset(eff_start), offset(eff_end)))
                 
         except Exception as e:
-            print(f"Skipping malformed event: {event} - {e}")
+            logger.warning("Skipping malformed event: %s - %s", event, e)
             continue
 
-    # 3. Merge overlapping intervals
-    if not busy_intervals:
-        # Whole day is free
-        duration = int((end_dt - start_dt).total_seconds() / 60)
-        if duration >= min_slot_minutes:
-            return [FreeSlot(
-                id="slot_1",
-                start=start_dt.strftime("%H:%M"),
-                end=end_dt.strftime("%H:%M"),
-                duration_minutes=duration
-            )]
-        return []
-        
-    # Sort by start time
-    busy_intervals.sort(key=lambda x: x.start)
+    # 3. Merge busy intervals and invert them into free slots
+    free = _free_intervals(
+        busy_intervals,
+        offset(start_dt),
+        offset(end_dt),
+        min_slot_minutes * _USEC_PER_MINUTE
+    )
     
-    merged: List[TimeInterval] = []
-    current = busy_intervals[0]
-    
-    for next_int in busy_intervals[1:]:
-        if next_int.start <= current.end:
-            # Overlap or adjacent, merge
-            current.end = max(current.end, next_int.end)
-        else:
-            merged.append(current)
-            current = next_int
-    merged.append(current)
-    
-    # 4. Invert to find free slots
-    free_slots: List[FreeSlot] = []
-    cursor = start_dt
-    
-    slot_counter = 1
-    
-    for busy in merged:
-        # Free time before this busy block?
-        if cursor < busy.start:
-            duration = int((busy.start - cursor).total_seconds() / 60)
-            if duration >= min_slot_minutes:
-                free_slots.append(FreeSlot(
-                    id=f"slot_{slot_counter}",
-                    start=cursor.strftime("%H:%M"),
-                    end=busy.start.strftime("%H:%M"),
-                    duration_minutes=duration
-                ))
-                slot_counter += 1
-        cursor = max(cursor, busy.end)
-        
-    # Check remaining time after last busy block
-    if cursor < end_dt:
-        duration = int((end_dt - cursor).total_seconds() / 60)
-        if duration >= min_slot_minutes:
-            free_slots.append(FreeSlot(
-                id=f"slot_{slot_counter}",
-                start=cursor.strftime("%H:%M"),
-                end=end_dt.strftime("%H:%M"),
-                duration_minutes=duration
-            ))
-
-    return free_slots
-
-
-
-
-
+    return [
+        FreeSlot(
+            id=f"slot_{index}",
+            start=_format_offset(slot_start),
+            end=_format_offset(slot_end),
+            duration_minutes=(slot_end - slot_start) // _USEC_PER_MINUTE
+        )
+        for index, (slot_start, slot_end) in enumerate(free, start=1)
+    ]
@@ -1,17 +1,27 @@
 import os
-import json
+import orjson
+import asyncio
+import logging
+import threading
+import google_auth_httplib2
 from google.oauth2.credentials import Credentials
 from google.auth.credentials import Credentials as BaseCredentials
 from google.auth.transport.requests import Request
 from google.auth.exceptions import RefreshError
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import build_http
 from googleapiclient.errors import HttpError
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import List, Optional
 from app.schemas.common import Event
+from app.core.cache import TTLCache
+from app.core.encryption import hash_tokens
 from app.core.exceptions import AuthenticationError, CalendarError
 
+logger = logging.getLogger(__name__)
+
 
 class StaticCredentials(BaseCredentials):
     """
@@ -22,6 +32,8 @@ class StaticCredentials(BaseCredentials):
     def __init__(self, token):
         super().__init__()
         self.token = token
+        # The token never changes, so the header value is built once
+        self._authorization = f'Bearer {token}'
     
     @property
     def expired(self):
@@ -40,12 +52,68 @@ class StaticCredentials(BaseCredentials):
     
     def apply(self, headers, token=None):
         # Apply the access token to the request headers
-        headers['authorization'] = f'Bearer {token or self.token}'
+        headers['authorization'] = f'Bearer {token}' if token else self._authorization
     
     def before_request(self, request, method, url, headers):
         # Override to skip refresh logic entirely
         # Just apply the token to headers without any refresh attempt
-        self.apply(headers, token=self.token)
+        headers['authorization'] = self._authorization
+
+@lru_cache(maxsize=None)
+def load_discovery_document() -> dict:
+    """
+    Calendar v3 discovery document, read and parsed once from the copy
+    bundled with google-api-python-client instead of on every service build.
+    """
+    document = orjson.loads(get_static_doc('calendar', 'v3'))
+    # Building a service and its resources fills in the document's default
+    # parameters in place; do it once here so later builds, from any thread,
+    # only read it
+    service = build_from_document(document, credentials=StaticCredentials(token=None))
+    for resource in document.get('resources', {}):
+        getattr(service, resource)()
+    return document
+
+
+# Tokens the frontend uses for demo data, never valid with Google
+_PLACEHOLDER_TOKEN_PREFIXES = ('demo_', 'mock_')
+
+# Token refreshes share one requests session (and its connection pool)
+_refresh_request = Request()
+
+def _rfc3339_utc(value: datetime) -> str:
+    """RFC 3339 UTC timestamp for the Calendar API; naive datetimes are taken as UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat() + 'Z'
+
+
+# Socket timeout (seconds) for Calendar API calls, so a hung call can't pin
+# a worker thread for the library's 60s default
+CALENDAR_HTTP_TIMEOUT = 10
+
+_thread_local = threading.local()
+
+
+def _thread_http():
+    """
+    httplib2.Http for the current thread. Http objects aren't thread-safe, so
+    each worker thread keeps its own, and its connections to Google stay open
+    across requests instead of each built service starting a new TLS session.
+    """
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = _thread_local.http = build_http()
+        http.timeout = CALENDAR_HTTP_TIMEOUT
+    return http
+
+
+def _build_calendar(credentials):
+    return build_from_document(
+        load_discovery_document(),
+        http=google_auth_httplib2.AuthorizedHttp(credentials, http=_thread_http())
+    )
+
 
 class GoogleCalendarService:
     """
@@ -56,21 +124,49 @@ class GoogleCalendarService:
     # Updated scope to allow writing events
     SCOPES = ['https://www.googleapis.com/auth/calendar.events']
     
+    # Google recommends at most 50 calls per batch request
+    BATCH_SIZE = 50
+    
+    # Retries (with the client's exponential backoff) for event list reads on
+    # 5xx and rate-limit responses; inserts aren't retried as they'd duplicate
+    LIST_RETRIES = 2
+    
+    # How long fetched event lists are reused before asking Google again
+    EVENTS_CACHE_TTL = 60
+    
+    # How long a refreshed access token is reused for the same stored tokens
+    CREDENTIALS_CACHE_TTL = 24 * 3600
+    
+    # Refreshes are serialized per stored-token fingerprint over this many locks
+    REFRESH_LOCK_STRIPES = 64
+    
     def __init__(self):
+        # Event lists keyed by (token hash, window, max_results, calendar),
+        # plus the fetches currently running for each key
+        self._events_cache = TTLCache(maxsize=1000, ttl=self.EVENTS_CACHE_TTL)
+        self._events_inflight = {}
+        # Refreshed (access token, expiry) by stored-token fingerprint, for
+        # clients still sending the tokens from before the refresh. Only these
+        # values are shared; each call builds its own Credentials around them.
+        self._refreshed_tokens = TTLCache(maxsize=1000, ttl=self.CREDENTIALS_CACHE_TTL)
+        self._refresh_locks = tuple(threading.Lock() for _ in range(self.REFRESH_LOCK_STRIPES))
+        
         # Allow OAuth scope to change (e.g. if Google adds extra scopes)
         os.environ['OAUTHLIB_RELAX_TOKEN_SCOPE'] = '1'
         
         self.credentials_path = os.getenv('GOOGLE_CALENDAR_CREDENTIALS_PATH', 'google_credentials.json')
         self.credentials_json = os.getenv('GOOGLE_CREDENTIALS_JSON')
+        # Parsed client config, loaded by the first OAuth flow
+        self._client_config = None
         
         # Check if we have credentials either as file or env var
         self.credentials_available = os.path.exists(self.credentials_path) or bool(self.credentials_json)
         
         if not self.credentials_available:
-            print(f"Warning: Google Calendar credentials not found at {self.credentials_path} and GOOGLE_CREDENTIALS_JSON not set.")
-            print("Google Calendar features will not be available until credentials are configured.")
+            logger.warning("Google Calendar credentials not found at %s and GOOGLE_CREDENTIALS_JSON not set.", self.credentials_path)
+            logger.warning("Google Calendar features will not be available until credentials are configured.")
         else:
-            print("Google Calendar Service initialized with credentials.")
+            logger.info("Google Calendar Service initialized with credentials.")
 
     def _check_credentials(self):
         """Check if credentials are available before operations"""
@@ -82,22 +178,27 @@ class GoogleCalendarService:
     
     def _get_flow(self, redirect_uri: str):
         """Helper to create Flow from file or env var"""
-        if self.credentials_json:
-            try:
-                config = json.loads(self.credentials_json)
-                return Flow.from_client_config(
-                    config,
-                    scopes=self.SCOPES,
-                    redirect_uri=redirect_uri
-                )
-            except json.JSONDecodeError as e:
-                raise CalendarError(f"Invalid JSON in GOOGLE_CREDENTIALS_JSON: {str(e)}")
-        else:
-            return Flow.from_client_secrets_file(
-                self.credentials_path,
-                scopes=self.SCOPES,
-                redirect_uri=redirect_uri
-            )
+        # Only the calendar connect flow needs oauthlib, so it is loaded on first use
+        from google_auth_oauthlib.flow import Flow
+        
+        return Flow.from_client_config(
+            self._get_client_config(),
+            scopes=self.SCOPES,
+            redirect_uri=redirect_uri
+        )
+
+    def _get_client_config(self) -> dict:
+        """OAuth client config from the env var or file, parsed on first use."""
+        if self._client_config is None:
+            if self.credentials_json:
+                try:
+                    self._client_config = orjson.loads(self.credentials_json)
+                except orjson.JSONDecodeError as e:
+                    raise CalendarError(f"Invalid JSON in GOOGLE_CREDENTIALS_JSON: {str(e)}")
+            else:
+                with open(self.credentials_path, 'rb') as f:
+                    self._client_config = orjson.loads(f.read())
+        return self._client_config
 
     def get_authorization_url(self, redirect_uri: str) -> str:
         """
@@ -129,9 +230,9 @@ class GoogleCalendarService:
         credentials = flow.credentials
         
         if not credentials.refresh_token:
-            print("⚠️ [exchange_code_for_tokens] No refresh_token received from Google! Token expiry will cause issues.")
+            logger.warning("[exchange_code_for_tokens] No refresh_token received from Google! Token expiry will cause issues.")
         else:
-            print("✅ [exchange_code_for_tokens] Refresh token received.")
+            logger.debug("[exchange_code_for_tokens] Refresh token received.")
             
         token_data = {
             'token': credentials.token,  # For frontend compatibility
@@ -140,24 +241,23 @@ class GoogleCalendarService:
             'token_uri': credentials.token_uri,
             'client_id': credentials.client_id,
             'client_secret': credentials.client_secret,
-            'scopes': credentials.scopes
+            'scopes': credentials.scopes,
+            # Lets later calls refresh shortly before expiry instead of after a 401
+            'expiry': credentials.expiry.isoformat() if credentials.expiry else None
         }
-        print(f"[exchange_code_for_tokens] Returning tokens. Access token length: {len(credentials.token) if credentials.token else 0}")
+        logger.debug("[exchange_code_for_tokens] Returning tokens. Access token length: %d", len(credentials.token or ""))
         return token_data
     
     def _get_calendar_service(self, user_tokens: dict):
         """Helper to build the Calendar service from tokens."""
         try:
-            # Get the actual access token
-            token = user_tokens.get('token') or user_tokens.get('access_token', '')
-            access_token = user_tokens.get('access_token') or user_tokens.get('token', '')
-            
-            # Use the access_token for the token field (Google OAuth format)
-            actual_token = access_token or token
+            # Use the access_token for the token field (Google OAuth format),
+            # falling back to 'token' as older stored tokens name it
+            actual_token = user_tokens.get('access_token') or user_tokens.get('token') or ''
             
             # Check for demo/mock tokens
-            if not actual_token or len(actual_token) < 10 or actual_token.startswith('demo_') or actual_token.startswith('mock_'):
-                print(f"[_get_calendar_service] Invalid token detected. Length: {len(actual_token) if actual_token else 0}")
+            if len(actual_token) < 10 or actual_token.startswith(_PLACEHOLDER_TOKEN_PREFIXES):
+                logger.info("[_get_calendar_service] Invalid token detected. Length: %d", len(actual_token))
                 raise AuthenticationError(
                     f"Invalid or expired calendar tokens detected. Please reconnect your Google Calendar."
                 )
@@ -168,76 +268,119 @@ class GoogleCalendarService:
             if is_clerk_token:
                 # Clerk tokens: use access token directly, no refresh capability
                 # Clerk manages token refresh on their side
-                print("[_get_calendar_service] Using Clerk-sourced token (no refresh)")
+                logger.debug("[_get_calendar_service] Using Clerk-sourced token (no refresh)")
                 
                 # Use StaticCredentials which won't try to refresh
                 credentials = StaticCredentials(token=actual_token)
                 
-                return build('calendar', 'v3', credentials=credentials)
+                return _build_calendar(credentials)
             
-            # Standard OAuth flow tokens (from our own OAuth)
-            # Validate required fields for refresh
-            if not user_tokens.get('client_id') or not user_tokens.get('client_secret'):
-                print("⚠️ [_get_calendar_service] Missing client_id or client_secret in tokens! Token refresh will fail.")
-            
-            if not user_tokens.get('refresh_token'):
-                print("⚠️ [_get_calendar_service] Missing refresh_token! Token refresh will fail if access token is expired.")
-
-            # Create credentials from stored tokens
-            try:
-                # Ensure scopes is a list
-                scopes = user_tokens.get('scopes', [])
-                if isinstance(scopes, str):
-                    scopes = [scopes]
-                
-                # Construct info dict for from_authorized_user_info
-                info = {
-                    'token': actual_token,
-                    'refresh_token': user_tokens.get('refresh_token'),
-                    'token_uri': user_tokens.get('token_uri', 'https://oauth2.googleapis.com/token'),
-                    'client_id': user_tokens.get('client_id'),
-                    'client_secret': user_tokens.get('client_secret'),
-                    'scopes': scopes
-                }
-                
-                credentials = Credentials.from_authorized_user_info(info, scopes=scopes)
-            except Exception as cred_err:
-                print(f"Error using from_authorized_user_info: {cred_err}")
-                # Fallback to manual creation
-                token_dict = {
-                    'token': actual_token,
-                    'refresh_token': user_tokens.get('refresh_token'),
-                    'token_uri': user_tokens.get('token_uri', 'https://oauth2.googleapis.com/token'),
-                    'client_id': user_tokens.get('client_id'),
-                    'client_secret': user_tokens.get('client_secret'),
-                    'scopes': scopes
-                }
-                credentials = Credentials(**token_dict)
+            # Standard OAuth flow tokens (from our own OAuth). A token
+            # refreshed by an earlier call for the same stored tokens is reused
+            # rather than refreshed again
+            tokens_hash = hash_tokens(user_tokens)
+            credentials = self._credentials_from_tokens(
+                user_tokens, *self._refreshed_tokens.get(tokens_hash, (actual_token, user_tokens.get('expiry')))
+            )
             
-            # Refresh if expired
+            # Refresh if expired (or about to expire)
             if credentials.expired and credentials.refresh_token:
-                print("[_get_calendar_service] Token expired, refreshing...")
-                credentials.refresh(Request())
-                print("[_get_calendar_service] Token refreshed successfully.")
+                credentials = self._refresh_credentials(user_tokens, tokens_hash)
                 
-            return build('calendar', 'v3', credentials=credentials)
+            return _build_calendar(credentials)
             
         except AuthenticationError:
             raise
         except RefreshError as e:
-            print(f"Token refresh failed: {e}")
+            logger.warning("Token refresh failed: %s", e)
             raise AuthenticationError("Token expired or invalid. Please reconnect your calendar.")
         except Exception as e:
-            print(f"Error creating credentials: {e}")
+            logger.error("Error creating credentials: %s", e)
             raise CalendarError(f"Failed to initialize calendar credentials: {str(e)}")
 
 
+    def _refresh_credentials(self, user_tokens: dict, tokens_hash: str) -> Credentials:
+        """
+        Refresh the access token for the given stored tokens, at most once per
+        expiry across concurrent calls. Callers that can store the result pick
+        it up through get_refreshed_tokens.
+        """
+        with self._refresh_locks[hash(tokens_hash) % self.REFRESH_LOCK_STRIPES]:
+            # Another call may have refreshed while this one waited for the lock
+            token, expiry = self._refreshed_tokens.get(
+                tokens_hash, (user_tokens.get('access_token') or user_tokens.get('token'), user_tokens.get('expiry'))
+            )
+            credentials = self._credentials_from_tokens(user_tokens, token, expiry)
+            if not credentials.expired:
+                return credentials
+            
+            logger.debug("[_get_calendar_service] Token expired, refreshing...")
+            credentials.refresh(_refresh_request)
+            logger.debug("[_get_calendar_service] Token refreshed successfully.")
+            
+            expiry = credentials.expiry.isoformat() if credentials.expiry else None
+            self._refreshed_tokens.set(tokens_hash, (credentials.token, expiry))
+            return credentials
+
+    def get_refreshed_tokens(self, user_tokens: dict) -> Optional[dict]:
+        """
+        The tokens to store in place of `user_tokens` once a call has refreshed
+        their access token, or None if it hasn't been refreshed.
+        """
+        refreshed = self._refreshed_tokens.get(hash_tokens(user_tokens))
+        if refreshed is None:
+            return None
+        token, expiry = refreshed
+        tokens = {**user_tokens, 'access_token': token, 'expiry': expiry}
+        if 'token' in user_tokens:
+            tokens['token'] = token
+        return tokens
+
+    def _credentials_from_tokens(self, user_tokens: dict, actual_token: str, expiry: Optional[str]) -> Credentials:
+        """OAuth credentials for tokens stored from our own OAuth flow."""
+        refresh_token = user_tokens.get('refresh_token')
+        client_id = user_tokens.get('client_id')
+        client_secret = user_tokens.get('client_secret')
+        
+        # Validate required fields for refresh
+        if not client_id or not client_secret:
+            logger.warning("[_get_calendar_service] Missing client_id or client_secret in tokens! Token refresh will fail.")
+        
+        if not refresh_token:
+            logger.warning("[_get_calendar_service] Missing refresh_token! Token refresh will fail if access token is expired.")
+
+        # Ensure scopes is a list
+        scopes = user_tokens.get('scopes', [])
+        if isinstance(scopes, str):
+            scopes = [scopes]
+        
+        info = {
+            'token': actual_token,
+            'refresh_token': refresh_token,
+            'token_uri': user_tokens.get('token_uri', 'https://oauth2.googleapis.com/token'),
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'scopes': scopes
+        }
+        
+        # Create credentials from stored tokens
+        try:
+            credentials = Credentials.from_authorized_user_info(
+                {**info, 'expiry': expiry}, scopes=scopes
+            )
+        except Exception as cred_err:
+            logger.warning("Error using from_authorized_user_info: %s", cred_err)
+            # Fallback to manual creation
+            credentials = Credentials(**info)
+        return credentials
+
     def get_events(
         self, 
         user_tokens: dict,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        max_results: int = 50
+        max_results: int = 50,
+        calendar_id: str = 'primary'
     ) -> List[Event]:
         """
         Fetch calendar events from user's Google Calendar.
@@ -251,40 +394,35 @@ class GoogleCalendarService:
             if not end_date:
                 end_date = start_date + timedelta(days=7)
             
-            # Format for API - ensure proper RFC3339 format
-            if start_date.tzinfo:
-                time_min = start_date.isoformat()
-            else:
-                time_min = start_date.isoformat() + 'Z'
-                
-            if end_date.tzinfo:
-                time_max = end_date.isoformat()
-            else:
-                time_max = end_date.isoformat() + 'Z'
+            time_min = _rfc3339_utc(start_date)
+            time_max = _rfc3339_utc(end_date)
             
-            print(f"Fetching events from {time_min} to {time_max}")
+            logger.debug("Fetching events from %s to %s", time_min, time_max)
             
             # Fetch events
             events_result = service.events().list(
-                calendarId='primary',
+                calendarId=calendar_id,
                 timeMin=time_min,
                 timeMax=time_max,
                 maxResults=max_results,
                 singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+                orderBy='startTime',
+                # Only what _convert_google_events reads; all-day events come
+                # back with empty start/end and are dropped there
+                fields='items(summary,start/dateTime,end/dateTime)'
+            ).execute(num_retries=self.LIST_RETRIES)
             
             events = events_result.get('items', [])
-            print(f"[get_events] Google API returned {len(events)} raw events")
+            logger.debug("[get_events] Google API returned %d raw events", len(events))
             
             # Convert to our Event format
             converted = self._convert_google_events(events)
-            print(f"[get_events] Converted to {len(converted)} events (all-day events filtered out)")
+            logger.debug("[get_events] Converted to %d events (all-day events filtered out)", len(converted))
             return converted
             
         except HttpError as error:
-            print(f'An error occurred: {error}')
-            print(f'Error details: {error.resp.status} - {error.content}')
+            logger.error('An error occurred: %s', error)
+            logger.error('Error details: %s - %s', error.resp.status, error.content)
             
             # Handle 403 - API Not Enabled or Usage Limit
             if error.resp.status == 403 and 'accessNotConfigured' in str(error):
@@ -298,58 +436,87 @@ class GoogleCalendarService:
                 
             raise CalendarError(f"Failed to fetch calendar events: {error}")
         except Exception as e:
-            print(f"Unexpected error in get_events: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Unexpected error in get_events: %s", e)
             raise CalendarError(f"Unexpected error fetching events: {str(e)}")
     
-    def _convert_google_events(self, google_events: list) -> List[Event]:
-        """Convert Google Calendar events to our Event format."""
-        converted_events = []
+    async def get_events_async(
+        self,
+        user_tokens: dict,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        max_results: int = 50,
+        calendar_id: str = 'primary'
+    ) -> List[Event]:
+        """
+        Async variant of get_events for use from async endpoints.
+        The blocking Google client call runs in a worker thread so the event
+        loop stays free. Results are cached for EVENTS_CACHE_TTL seconds, and
+        concurrent requests for the same window share a single fetch.
+        """
+        key = (
+            hash_tokens(user_tokens),
+            start_date.isoformat() if start_date else None,
+            end_date.isoformat() if end_date else None,
+            max_results,
+            calendar_id,
+        )
         
-        for event in google_events:
-            event_title = event.get('summary', 'Untitled')
-            
-            # Skip all-day events
-            if 'dateTime' not in event.get('start', {}):
-                print(f"[_convert_google_events] Skipping all-day event: {event_title}")
-                continue
-            
-            start = event['start'].get('dateTime')
-            end = event['end'].get('dateTime')
-            
-            if start and end:
-                print(f"[_convert_google_events] Converting event: {event_title} ({start} to {end})")
-                # Use the full ISO string for the date, so the frontend can parse it correctly
-                # Note: AIService.analyze_calendar_gaps might need adjustment if it expects HH:MM
-                # But for the week view, we definitely need the full date.
-                
-                converted_events.append(Event(
-                    title=event.get('summary', 'Busy'),
-                    start_time=start, # Pass full ISO string
-                    end_time=end      # Pass full ISO string
-                ))
+        events = self._events_cache.get(key)
+        if events is not None:
+            return events
+        
+        fetch = self._events_inflight.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(asyncio.to_thread(
+                self.get_events, user_tokens, start_date, end_date, max_results, calendar_id
+            ))
+            self._events_inflight[key] = fetch
+            fetch.add_done_callback(lambda done: self._events_fetched(key, done))
         
-        return converted_events
+        # Shielded so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(fetch)
+    
+    def _events_fetched(self, key: tuple, fetch: asyncio.Future) -> None:
+        self._events_inflight.pop(key, None)
+        if not fetch.cancelled() and fetch.exception() is None:
+            self._events_cache.set(key, fetch.result())
+    
+    def _invalidate_events(self, user_tokens: dict) -> None:
+        """Drop cached event lists for this user after their calendar changed."""
+        token_hash = hash_tokens(user_tokens)
+        self._events_cache.pop_matching(lambda key: key[0] == token_hash)
+    
+    def _convert_google_events(self, google_events: list) -> List[Event]:
+        """
+        Convert Google Calendar events to our Event format, skipping all-day
+        events (those without start/end dateTime). Start and end stay full ISO
+        strings so the frontend can place them on the right day.
+        """
+        return [
+            Event(title=event.get('summary', 'Busy'), start_time=start, end_time=end)
+            for event in google_events
+            if (start := event.get('start', {}).get('dateTime'))
+            and (end := event.get('end', {}).get('dateTime'))
+        ]
     
     def get_today_events(self, user_tokens: dict) -> List[Event]:
         """Convenience method to get today's events."""
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
         end_of_day = start_of_day + timedelta(days=1)
         
         return self.get_events(user_tokens, start_of_day, end_of_day)
 
-    def create_event(self, user_tokens: dict, summary: str, start_time: str, end_time: str, description: str = None, timezone: str = 'UTC'):
-        """
-        Create a new event in the primary calendar.
-        start_time and end_time should be ISO 8601 strings.
-        """
-        self._check_credentials()
-        
-        service = self._get_calendar_service(user_tokens)
+    async def get_today_events_async(self, user_tokens: dict) -> List[Event]:
+        """Async variant of get_today_events."""
+        now = datetime.now(timezone.utc)
+        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_of_day = start_of_day + timedelta(days=1)
         
-        event_body = {
+        return await self.get_events_async(user_tokens, start_of_day, end_of_day)
+
+    def _build_event_body(self, summary: str, start_time: str, end_time: str, description: str = None, timezone: str = 'UTC') -> dict:
+        return {
             'summary': summary,
             'description': description,
             'start': {
@@ -361,11 +528,73 @@ class GoogleCalendarService:
                 'timeZone': timezone,
             },
         }
+
+    def _event_error(self, e: HttpError) -> Exception:
+        if e.resp.status == 401:
+            return AuthenticationError("Google Calendar token expired or invalid")
+        return CalendarError(f"Failed to create event: {e}")
+
+    def create_event(self, user_tokens: dict, summary: str, start_time: str, end_time: str, description: str = None, timezone: str = 'UTC'):
+        """
+        Create a new event in the primary calendar.
+        start_time and end_time should be ISO 8601 strings.
+        """
+        self._check_credentials()
+        
+        service = self._get_calendar_service(user_tokens)
+        
+        event_body = self._build_event_body(summary, start_time, end_time, description, timezone)
         
         try:
             event = service.events().insert(calendarId='primary', body=event_body).execute()
+            self._invalidate_events(user_tokens)
             return event
         except HttpError as e:
-            if e.resp.status == 401:
-                raise AuthenticationError("Google Calendar token expired or invalid")
-            raise CalendarError(f"Failed to create event: {e}")
+            raise self._event_error(e)
+
+    def create_events_bulk(self, user_tokens: dict, events: List[dict], timezone: str = 'UTC') -> list:
+        """
+        Create several events in the primary calendar using HTTP batch requests,
+        sending up to BATCH_SIZE inserts per round trip.
+        
+        Each item in `events` has the keys summary, start_time, end_time and
+        optionally description (same meaning as create_event's arguments).
+        Returns a list aligned with `events` holding either the created event
+        or the exception raised for it (batches are not atomic).
+        """
+        self._check_credentials()
+        
+        service = self._get_calendar_service(user_tokens)
+        results = [None] * len(events)
+        
+        def collect(request_id, response, exception):
+            if exception is None:
+                results[int(request_id)] = response
+            elif isinstance(exception, HttpError):
+                results[int(request_id)] = self._event_error(exception)
+            else:
+                results[int(request_id)] = exception
+        
+        for offset in range(0, len(events), self.BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=collect)
+            for index, event in enumerate(events[offset:offset + self.BATCH_SIZE], start=offset):
+                body = self._build_event_body(
+                    event['summary'],
+                    event['start_time'],
+                    event['end_time'],
+                    event.get('description'),
+                    timezone
+                )
+                batch.add(service.events().insert(calendarId='primary', body=body), request_id=str(index))
+            try:
+                batch.execute()
+            except HttpError as e:
+                raise self._event_error(e)
+            finally:
+                self._invalidate_events(user_tokens)
+        
+        return results
+
+
+# Shared instance used by the API endpoints
+gcal_service = GoogleCalendarService()
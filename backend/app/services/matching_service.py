@@ -1,7 +1,8 @@
 from datetime import datetime, timedelta
 from typing import List, Optional, Tuple
+from fastapi import Request
 from app.schemas.task import Task
-from app.schemas.common import Event, Gap
+from app.schemas.common import Gap
 from pydantic import BaseModel
 
 class ScheduledTask(BaseModel):
@@ -248,7 +249,6 @@ class TaskMatcher:
         fit_score: float
     ) -> ScheduledTask:
         """Create a scheduled task from a task and gap with explanation."""
-        from datetime import datetime, timedelta
         
         # Parse gap start time
         start = datetime.strptime(gap.start_time, "%H:%M")
@@ -276,7 +276,6 @@ class TaskMatcher:
         gap = gaps[gap_index]
         
         # Calculate new gap start time
-        from datetime import datetime, timedelta
         old_start = datetime.strptime(gap.start_time, "%H:%M")
         new_start = old_start + timedelta(minutes=duration)
         
@@ -379,3 +378,8 @@ class TaskMatcher:
             )
         
         return "\n".join(lines)
+
+
+def get_task_matcher(request: Request) -> TaskMatcher:
+    """Dependency returning the TaskMatcher built in the app lifespan."""
+    return request.app.state.task_matcher
@@ -0,0 +1,97 @@
+import uuid
+from typing import Optional
+from fastapi import Depends, Request
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from app.db.session import get_db
+from app.core.security import get_current_user
+from app.core.encryption import encrypt_tokens, hash_tokens
+from app.core.cache import TTLCache
+from app.models.all_models import User
+
+_INSERT_BY_DIALECT = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# clerk_user_id -> users.id; the mapping never changes once a user exists
+_user_id_cache = TTLCache(maxsize=10_000, ttl=300)
+
+
+def get_or_create_user(clerk_user_id: str, email: Optional[str], db: Session) -> User:
+    """
+    Get existing user or create a new one.
+
+    The common case is a single indexed SELECT. New users are created with
+    INSERT ... ON CONFLICT (clerk_user_id) DO UPDATE ... RETURNING, which is
+    race-free without a rollback/retry path.
+    """
+    user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
+    if user:
+        return user
+
+    email = email or f"{clerk_user_id}@noemail.com"
+    insert = _INSERT_BY_DIALECT[db.get_bind().dialect.name]
+    stmt = (
+        insert(User)
+        .values(clerk_user_id=clerk_user_id, email=email)
+        .on_conflict_do_update(
+            index_elements=[User.clerk_user_id],
+            set_={"clerk_user_id": clerk_user_id}
+        )
+        .returning(User)
+    )
+    user = db.scalars(stmt, execution_options={"populate_existing": True}).one()
+    db.commit()
+    return user
+
+
+def get_current_db_user(
+    request: Request,
+    user_data: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    FastAPI dependency returning the authenticated user's database row.
+    The row is loaded (or created) once and kept on request.state for the
+    rest of the request.
+    """
+    user = getattr(request.state, "db_user", None)
+    if user is None:
+        user = get_or_create_user(user_data.get("sub"), user_data.get("email"), db)
+        request.state.db_user = user
+        _user_id_cache.set(user.clerk_user_id, user.id)
+    return user
+
+
+def get_current_user_id(
+    request: Request,
+    user_data: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> uuid.UUID:
+    """
+    FastAPI dependency returning only the authenticated user's id.
+    Served from a process-wide cache, so endpoints that just filter by
+    user_id skip the users lookup entirely on a hit.
+    """
+    user_id = _user_id_cache.get(user_data.get("sub"))
+    if user_id is None:
+        user_id = get_current_db_user(request, user_data, db).id
+    return user_id
+
+
+def save_calendar_tokens(user: User, tokens: dict, db: Session) -> bool:
+    """
+    Encrypt and store calendar tokens on the user's row.
+    Re-sending the tokens already stored skips both the encryption and the
+    UPDATE. Returns whether anything was written.
+    """
+    tokens_hash = hash_tokens(tokens)
+    if user.calendar_tokens and user.calendar_tokens_hash == tokens_hash:
+        return False
+    
+    user.calendar_tokens = encrypt_tokens(tokens)
+    user.calendar_tokens_hash = tokens_hash
+    db.commit()
+    return True
+
@@ -1,14 +1,52 @@
+import asyncio
+import httpx
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.session import engine, Base
+from app.db.views import refresh_views_periodically, uses_materialized_views
 from app.api.v1.router import api_router
+from app.api.v1.endpoints.clerk_tokens import close_clerk_http
+from app.services.google_calendar_service import load_discovery_document
+from app.services.ai_service import AIService
+from app.services.ai_log_service import start_ai_log_writer, stop_ai_log_writer
+from app.services.matching_service import TaskMatcher
 from app.core.exceptions import TimeOptiException
+from app.core.log_queue import start_log_listener, stop_log_listener
 
 # Create tables on startup
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="TimeOpti API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_log_listener()
+    # Warm the Calendar discovery document before the first request
+    load_discovery_document()
+    # One pooled client for outbound LLM calls, shared by every request
+    app.state.http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=httpx.Timeout(60.0, connect=5.0)
+    )
+    app.state.ai_service = AIService(http_client=app.state.http_client)
+    app.state.task_matcher = TaskMatcher()
+    start_ai_log_writer()
+    refresh_task = None
+    if uses_materialized_views(engine):
+        refresh_task = asyncio.create_task(refresh_views_periodically())
+    yield
+    if refresh_task:
+        refresh_task.cancel()
+    # Close shared HTTP clients on shutdown
+    await app.state.http_client.aclose()
+    await close_clerk_http()
+    # Flush AI logs still queued for the batch writer
+    await asyncio.to_thread(stop_ai_log_writer)
+    stop_log_listener()
+
+
+app = FastAPI(title="TimeOpti API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configure CORS
 origins = [
@@ -20,13 +58,17 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists let preflight responses use headers built once at startup
+    # instead of echoing each request's Access-Control-Request-Headers
+    allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    # Let the frontend read ETags to send back as If-None-Match
+    expose_headers=["ETag"],
 )
 
 @app.exception_handler(TimeOptiException)
 async def timeopti_exception_handler(request: Request, exc: TimeOptiException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.message},
     )
@@ -0,0 +1,31 @@
+"""index_user_id_on_logs_and_recommendations
+
+Revision ID: b7c1d2e3f4a5
+Revises: eecfe7d19d97
+Create Date: 2026-10-15 09:12:41.310522
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1d2e3f4a5'
+down_revision: Union[str, Sequence[str], None] = 'eecfe7d19d97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Support the per-user aggregate joins in /admin/users
+    op.create_index(op.f('ix_ai_logs_user_id'), 'ai_logs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_recommendations_user_id'), 'recommendations', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_recommendations_user_id'), table_name='recommendations')
+    op.drop_index(op.f('ix_ai_logs_user_id'), table_name='ai_logs')
@@ -0,0 +1,47 @@
+"""add_ai_endpoint_stats_view
+
+Revision ID: c3d4e5f6a7b8
+Revises: b7c1d2e3f4a5
+Create Date: 2026-10-15 10:04:18.552173
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, Sequence[str], None] = 'b7c1d2e3f4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Materialized views are PostgreSQL-only; other dialects aggregate ai_logs directly
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS ai_endpoint_stats AS
+        SELECT endpoint,
+               count(id) AS count,
+               avg(duration_ms) AS avg_duration,
+               sum(cost) AS total_cost,
+               sum(tokens_used) AS total_tokens
+        FROM ai_logs
+        GROUP BY endpoint
+    """)
+    # Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_ai_endpoint_stats_endpoint "
+        "ON ai_endpoint_stats (endpoint)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS ai_endpoint_stats")
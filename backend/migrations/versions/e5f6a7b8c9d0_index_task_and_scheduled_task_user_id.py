@@ -0,0 +1,32 @@
+"""index_task_and_scheduled_task_user_id
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-15 11:26:52.804117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, Sequence[str], None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_tasks_user_id'), 'tasks', ['user_id'], unique=False)
+    op.create_index('ix_scheduled_tasks_user_id_assigned_date', 'scheduled_tasks', ['user_id', 'assigned_date'], unique=False)
+    op.create_index('ix_scheduled_tasks_user_id_slot_id', 'scheduled_tasks', ['user_id', 'slot_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_scheduled_tasks_user_id_slot_id', table_name='scheduled_tasks')
+    op.drop_index('ix_scheduled_tasks_user_id_assigned_date', table_name='scheduled_tasks')
+    op.drop_index(op.f('ix_tasks_user_id'), table_name='tasks')
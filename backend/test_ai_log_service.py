@@ -0,0 +1,160 @@
+"""
+Tests for AI call logging: payload summaries and the batch writer.
+"""
+import asyncio
+import hashlib
+import queue
+import threading
+
+import orjson
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.services.ai_log_service as ai_log
+from app.db.session import Base
+from app.models.all_models import AILog
+
+
+def _sha1(data) -> str:
+    canonical = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    return hashlib.sha1(canonical).hexdigest()
+
+
+class TestSummarizePayload:
+    """Test the compact summaries stored in place of full payloads."""
+
+    def test_counts_and_excerpts(self):
+        data = {"tasks": [1, 2, 3], "meta": {"a": 1}, "note": "x" * 500, "scope": "today", "n": 4}
+        summary = ai_log.summarize_payload(data)
+        assert summary["sha1"] == _sha1(data)
+        assert summary["n_tasks"] == 3
+        assert summary["n_meta"] == 1
+        assert summary["note"] == "x" * ai_log.SUMMARY_EXCERPT_LENGTH
+        assert summary["scope"] == "today"
+        assert summary["n"] == 4
+        assert "tasks" not in summary and "meta" not in summary
+
+    def test_hash_ignores_key_order(self):
+        assert ai_log.summarize_payload({"a": 1, "b": 2})["sha1"] == ai_log.summarize_payload({"b": 2, "a": 1})["sha1"]
+
+    def test_non_dict_payloads_are_hashed_only(self):
+        assert ai_log.summarize_payload([1, 2]) == {"sha1": _sha1([1, 2])}
+        assert ai_log.summarize_payload("text") == {"sha1": _sha1("text")}
+        assert ai_log.summarize_payload(None) is None
+
+    def test_full_payload_mode(self, monkeypatch):
+        monkeypatch.setattr(ai_log, "AI_LOG_FULL_PAYLOAD", True)
+        data = {"tasks": [1, 2, 3]}
+        assert ai_log.summarize_payload(data) is data
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Record the batches handed to write_ai_logs instead of touching the database."""
+    batches = []
+    monkeypatch.setattr(ai_log, "write_ai_logs", lambda rows: batches.append(list(rows)))
+    monkeypatch.setattr(ai_log, "_log_queue", queue.Queue(maxsize=ai_log.AI_LOG_QUEUE_SIZE))
+    monkeypatch.setattr(ai_log, "_writer", None)
+    return batches
+
+
+def _row(index: int) -> dict:
+    return {"endpoint": "/optimize", "request_data": {"i": index}, "tokens_used": index}
+
+
+class TestBatchWriter:
+    """Test how log_ai_call hands rows to the batch writer thread."""
+
+    def test_stop_flushes_queued_rows(self, written):
+        ai_log.start_ai_log_writer()
+        for index in range(5):
+            ai_log.log_ai_call(BackgroundTasks(), **_row(index))
+        ai_log.stop_ai_log_writer()
+
+        assert ai_log._writer is None
+        rows = [row for batch in written for row in batch]
+        assert [row["tokens_used"] for row in rows] == list(range(5))
+        assert all(row["created_at"] is not None for row in rows)
+
+    def test_batches_are_capped(self, written, monkeypatch):
+        monkeypatch.setattr(ai_log, "AI_LOG_BATCH_SIZE", 2)
+        for index in range(5):
+            ai_log._log_queue.put(_row(index))
+        ai_log.start_ai_log_writer()
+        ai_log.stop_ai_log_writer()
+
+        assert [len(batch) for batch in written] == [2, 2, 1]
+
+    def test_full_queue_falls_back_to_background_task(self, written, monkeypatch):
+        monkeypatch.setattr(ai_log, "_log_queue", queue.Queue(maxsize=1))
+        monkeypatch.setattr(ai_log, "_writer", object())  # "running", but never drains
+        ai_log._log_queue.put(_row(0))
+
+        background_tasks = BackgroundTasks()
+        ai_log.log_ai_call(background_tasks, **_row(1))
+
+        assert ai_log._log_queue.qsize() == 1
+        assert len(background_tasks.tasks) == 1
+        task = background_tasks.tasks[0]
+        assert task.func is ai_log.write_ai_log
+        assert task.kwargs["tokens_used"] == 1
+        assert written == []
+
+    def test_error_rows_without_writer_leave_the_event_loop(self, monkeypatch):
+        monkeypatch.setattr(ai_log, "_writer", None)
+        done = threading.Event()
+        writer_threads = []
+
+        def record(rows):
+            writer_threads.append(threading.get_ident())
+            done.set()
+
+        monkeypatch.setattr(ai_log, "write_ai_logs", record)
+
+        async def call():
+            background_tasks = BackgroundTasks()
+            ai_log.log_ai_call(background_tasks, **_row(0), error="boom")
+            # Background tasks are dropped when the endpoint raises
+            assert background_tasks.tasks == []
+            assert await asyncio.to_thread(done.wait, 1)
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(call())
+        assert len(writer_threads) == 1
+        assert writer_threads[0] != loop_thread
+
+    def test_error_rows_from_worker_threads_are_written_directly(self, written):
+        ai_log.log_ai_call(BackgroundTasks(), **_row(0), error="boom")
+        assert len(written) == 1
+        assert written[0][0]["error"] == "boom"
+
+
+class TestWriteAILogs:
+    """Test that a batch is stored with a single executemany."""
+
+    def test_one_executemany_per_batch(self, monkeypatch):
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=engine)
+        monkeypatch.setattr(ai_log, "SessionLocal", sessionmaker(bind=engine))
+
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT"):
+                statements.append((executemany, len(parameters) if executemany else 1))
+
+        ai_log.write_ai_logs([_row(index) for index in range(10)])
+
+        assert statements == [(True, 10)]
+        db = sessionmaker(bind=engine)()
+        rows = db.query(AILog).order_by(AILog.tokens_used).all()
+        assert [row.tokens_used for row in rows] == list(range(10))
+        assert rows[3].request_data == {"sha1": _sha1({"i": 3}), "i": 3}
+        assert all(row.created_at is not None for row in rows)
+        db.close()
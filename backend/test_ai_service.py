@@ -0,0 +1,119 @@
+"""
+Tests for the calendar gap analysis in AIService.
+"""
+import random
+from datetime import datetime
+
+import pytest
+
+from app.schemas.common import Event
+from app.services.ai_service import AIService
+
+
+def reference_gaps(events, start_window, end_window):
+    """The original strptime-based gap analysis, kept to check the minute-based version against."""
+    fmt = "%H:%M"
+
+    def to_hhmm(value):
+        if 'T' in value:
+            try:
+                return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime(fmt)
+            except ValueError:
+                pass
+        return value
+
+    processed = sorted(
+        ((to_hhmm(event.start_time), to_hhmm(event.end_time)) for event in events),
+        key=lambda event: event[0]
+    )
+    gaps = []
+    current_time = datetime.strptime(start_window, fmt)
+    end_time = datetime.strptime(end_window, fmt)
+    for start, end in processed:
+        try:
+            event_start = datetime.strptime(start, fmt)
+            event_end = datetime.strptime(end, fmt)
+        except ValueError:
+            continue
+        if event_start > current_time:
+            gaps.append((current_time.strftime(fmt), event_start.strftime(fmt),
+                         int((event_start - current_time).total_seconds() / 60)))
+        current_time = max(current_time, event_end)
+    if current_time < end_time:
+        gaps.append((current_time.strftime(fmt), end_time.strftime(fmt),
+                     int((end_time - current_time).total_seconds() / 60)))
+    return gaps
+
+
+@pytest.fixture(scope="module")
+def service():
+    return AIService()
+
+
+def _gaps(service, events, start_window="08:00", end_window="18:00"):
+    return [
+        (gap.start_time, gap.end_time, gap.duration_minutes)
+        for gap in service.analyze_calendar_gaps(events, start_window, end_window)
+    ]
+
+
+def _random_time(rng, minutes):
+    hhmm = f"{minutes // 60:02d}:{minutes % 60:02d}"
+    kind = rng.random()
+    if kind < 0.4:
+        return hhmm
+    value = f"2023-10-27T{hhmm}"
+    if kind < 0.5:
+        return value
+    return value + rng.choice([":00", ":30.5", ":00Z", ":00+02:00", ":00-05:30", ".000Z"])
+
+
+class TestAnalyzeCalendarGaps:
+    """Test gap analysis over HH:MM and ISO event times."""
+
+    def test_gaps_between_events(self, service):
+        events = [
+            Event(title="a", start_time="09:00", end_time="10:00"),
+            Event(title="b", start_time="2023-10-27T12:00:00Z", end_time="2023-10-27T13:30:00+02:00"),
+        ]
+        assert _gaps(service, events) == [
+            ("08:00", "09:00", 60),
+            ("10:00", "12:00", 120),
+            ("13:30", "18:00", 270),
+        ]
+
+    def test_unpadded_hours_sort_numerically(self, service):
+        events = [
+            Event(title="a", start_time="10:00", end_time="11:00"),
+            Event(title="b", start_time="9:00", end_time="9:30"),
+        ]
+        assert _gaps(service, events) == [
+            ("08:00", "09:00", 60),
+            ("09:30", "10:00", 30),
+            ("11:00", "18:00", 420),
+        ]
+
+    def test_inverted_and_malformed_events_are_skipped(self, service):
+        events = [
+            Event(title="a", start_time="12:00", end_time="11:00"),
+            Event(title="b", start_time="25:00", end_time="26:00"),
+            Event(title="c", start_time="2023-10-27T25:00", end_time="2023-10-27T26:00"),
+        ]
+        assert _gaps(service, events) == [("08:00", "18:00", 600)]
+
+    def test_invalid_window(self, service):
+        assert service.analyze_calendar_gaps([], "8am", "18:00") == []
+
+    def test_matches_reference_on_random_days(self, service):
+        rng = random.Random(20231027)
+        for _ in range(2000):
+            events = []
+            for index in range(rng.randrange(10)):
+                start = rng.randrange(24 * 60)
+                end = rng.randrange(start, 24 * 60)
+                events.append(Event(title=str(index), start_time=_random_time(rng, start), end_time=_random_time(rng, end)))
+            if rng.random() < 0.2:
+                events.append(Event(title="bad", start_time=rng.choice(["25:00", "2023-10-27T24:30", "soon"]), end_time="10:00"))
+            start_window = rng.choice(["00:00", "07:30", "08:00", "09:15"])
+            end_window = rng.choice(["12:00", "18:00", "23:59"])
+            assert _gaps(service, events, start_window, end_window) == reference_gaps(events, start_window, end_window)
@@ -0,0 +1,60 @@
+"""
+Tests for in-process caching utilities.
+"""
+import pytest
+
+from app.core.cache import TTLCache, cached
+
+
+class TestTTLCache:
+    """Test expiry and eviction behaviour."""
+
+    def test_get_set(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_expired_entry_is_stale_only(self):
+        cache = TTLCache(ttl=60)
+        cache.set("a", 1, ttl=0)
+        assert cache.get("a") is None
+        assert cache.get_stale("a") == 1
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_pop_matching(self):
+        cache = TTLCache(ttl=60)
+        cache.set(("u1", "mon"), 1)
+        cache.set(("u1", "tue"), 2)
+        cache.set(("u2", "mon"), 3)
+        assert cache.pop_matching(lambda key: key[0] == "u1") == 2
+        assert cache.get(("u1", "mon")) is None
+        assert cache.get(("u2", "mon")) == 3
+
+
+def test_cached_serves_stale_value_on_error():
+    """Test that a failing call falls back to the last cached value."""
+    calls = []
+
+    @cached(ttl=0, key="k")
+    def compute(fail=False):
+        calls.append(fail)
+        if fail:
+            raise RuntimeError("source unavailable")
+        return len(calls)
+
+    assert compute() == 1
+    assert compute(fail=True) == 1
+
+    compute.cache.clear()
+    with pytest.raises(RuntimeError):
+        compute(fail=True)
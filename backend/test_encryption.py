@@ -60,6 +60,15 @@ class TestEncryption:
         # But both should decrypt to the same value
         assert decrypt_tokens(encrypted1) == tokens
         assert decrypt_tokens(encrypted2) == tokens
+    
+    def test_repeat_decrypt_returns_independent_dicts(self):
+        """Test that cached decryptions don't share the returned dict."""
+        encrypted = encrypt_tokens({"access_token": "test_token"})
+        
+        first = decrypt_tokens(encrypted)
+        first["access_token"] = "changed"
+        
+        assert decrypt_tokens(encrypted) == {"access_token": "test_token"}
 
 
 def test_missing_encryption_key():
@@ -1,5 +1,6 @@
+import random
 import unittest
-from datetime import datetime
+from datetime import datetime, time, timedelta
 from app.services.free_time_service import calculate_free_slots
 
 class TestFreeTimeService(unittest.TestCase):
@@ -81,6 +82,101 @@ class TestFreeTimeService(unittest.TestCase):
         self.assertEqual(slots[0].end, "14:00")
         self.assertEqual(slots[1].start, "15:30")
 
+def reference_free_slots(events, target_date, day_start="00:00", day_end="23:59",
+                         sleep_start="23:00", sleep_end="07:00", min_slot_minutes=15):
+    """The original datetime-based implementation, kept to check the offset version against."""
+    def hhmm(value):
+        return datetime.strptime(value, "%H:%M").time()
+
+    def parse(value, base):
+        if 'T' in value:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+        return datetime.combine(base, hhmm(value))
+
+    base = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    start_dt = datetime.combine(base, hhmm(day_start))
+    end_dt = datetime.combine(base, hhmm(day_end))
+
+    s_start, s_end = hhmm(sleep_start), hhmm(sleep_end)
+    if s_start > s_end:
+        busy = [
+            [datetime.combine(base, s_start), datetime.combine(base, time(23, 59, 59))],
+            [base, datetime.combine(base, s_end)],
+        ]
+    else:
+        busy = [[datetime.combine(base, s_start), datetime.combine(base, s_end)]]
+
+    for event in events:
+        try:
+            eff_start = max(start_dt, parse(event['start_time'], base))
+            eff_end = min(end_dt, parse(event['end_time'], base))
+        except ValueError:
+            continue
+        if eff_start < eff_end:
+            busy.append([eff_start, eff_end])
+
+    busy.sort(key=lambda interval: interval[0])
+    merged = [busy[0]]
+    for interval in busy[1:]:
+        if interval[0] <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], interval[1])
+        else:
+            merged.append(interval)
+
+    slots = []
+    cursor = start_dt
+    for busy_start, busy_end in merged + [[end_dt, end_dt]]:
+        if cursor < busy_start:
+            duration = int((busy_start - cursor).total_seconds() / 60)
+            if duration >= min_slot_minutes:
+                slots.append((cursor.strftime("%H:%M"), busy_start.strftime("%H:%M"), duration))
+        cursor = max(cursor, busy_end)
+    return slots
+
+
+class TestFreeTimeEquivalence(unittest.TestCase):
+    """Check the integer-offset implementation against the datetime-based one."""
+
+    def random_time(self, rng, target_date):
+        kind = rng.random()
+        if kind < 0.5:
+            return f"{rng.randrange(24):02d}:{rng.randrange(60):02d}"
+        dt = target_date + timedelta(days=rng.choice([-1, 0, 0, 0, 1]), seconds=rng.randrange(86400))
+        value = dt.isoformat()
+        if kind < 0.6:
+            return value + ".250000"
+        if kind < 0.75:
+            return value + "Z"
+        if kind < 0.9:
+            return value + rng.choice(["+02:00", "-05:30", "+00:00"])
+        return value
+
+    def test_random_days(self):
+        rng = random.Random(20231027)
+        target_date = datetime(2023, 10, 27, 15, 30)
+        for _ in range(2000):
+            events = [
+                {"start_time": self.random_time(rng, target_date), "end_time": self.random_time(rng, target_date)}
+                for _ in range(rng.randrange(12))
+            ]
+            if rng.random() < 0.1:
+                events.append({"start_time": "25:00", "end_time": "10:00"})
+            kwargs = {
+                "day_start": rng.choice(["00:00", "06:30", "08:00"]),
+                "day_end": rng.choice(["23:59", "18:00", "21:45"]),
+                "sleep_start": rng.choice(["23:00", "22:15", "13:00"]),
+                "sleep_end": rng.choice(["07:00", "06:45", "14:00"]),
+                "min_slot_minutes": rng.choice([0, 1, 15, 30]),
+            }
+            expected = reference_free_slots(events, target_date, **kwargs)
+            slots = calculate_free_slots(events, target_date, **kwargs)
+            self.assertEqual(
+                [(slot.start, slot.end, slot.duration_minutes) for slot in slots],
+                expected,
+                msg=f"{events} {kwargs}"
+            )
+            self.assertEqual([slot.id for slot in slots], [f"slot_{i}" for i in range(1, len(slots) + 1)])
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,143 @@
+"""
+Tests for OAuth token refresh in the Google Calendar service.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+os.environ.setdefault("ENCRYPTION_KEY", "test_encryption_key_for_testing_only")
+
+from fastapi.testclient import TestClient
+from google.oauth2.credentials import Credentials
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.services.google_calendar_service as gcal
+from app.core.encryption import decrypt_tokens
+from app.core.security import get_current_user
+from app.db.session import Base, get_db
+from app.models.all_models import User
+
+
+def _expired_tokens(access_token: str = "expired_access_token") -> dict:
+    return {
+        "token": access_token,
+        "access_token": access_token,
+        "refresh_token": "refresh_token",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "client_id": "client_id",
+        "client_secret": "client_secret",
+        "scopes": ["https://www.googleapis.com/auth/calendar.events"],
+        "expiry": (datetime.utcnow() - timedelta(hours=1)).isoformat(),
+    }
+
+
+class _FakeCalendar:
+    """Stands in for the built Calendar API service."""
+
+    def __init__(self, credentials):
+        self.credentials = credentials
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        return self
+
+    def execute(self, num_retries=0):
+        return {"items": []}
+
+
+@pytest.fixture
+def refreshes(monkeypatch):
+    """Count token refreshes instead of calling Google."""
+    calls = []
+
+    def fake_refresh(credentials, request):
+        calls.append(credentials.token)
+        time.sleep(0.05)  # keep the refresh in flight while other threads arrive
+        credentials.token = "refreshed_access_token"
+        credentials.expiry = datetime.utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(Credentials, "refresh", fake_refresh)
+    monkeypatch.setattr(gcal, "_build_calendar", _FakeCalendar)
+    return calls
+
+
+class TestTokenRefresh:
+    """Test that expired access tokens are refreshed once and reused."""
+
+    def test_concurrent_calls_refresh_once(self, refreshes):
+        service = gcal.GoogleCalendarService()
+        tokens = _expired_tokens()
+        results = []
+
+        def call():
+            results.append(service._get_calendar_service(tokens).credentials.token)
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert refreshes == ["expired_access_token"]
+        assert results == ["refreshed_access_token"] * 8
+
+    def test_refreshed_tokens_reuse_new_access_token(self, refreshes):
+        service = gcal.GoogleCalendarService()
+        tokens = _expired_tokens()
+        assert service.get_refreshed_tokens(tokens) is None
+
+        service._get_calendar_service(tokens)
+        refreshed = service.get_refreshed_tokens(tokens)
+
+        assert refreshed["access_token"] == refreshed["token"] == "refreshed_access_token"
+        assert refreshed["refresh_token"] == tokens["refresh_token"]
+        assert datetime.fromisoformat(refreshed["expiry"]) > datetime.utcnow()
+        # Stored tokens that are already fresh aren't refreshed again
+        service._get_calendar_service(refreshed)
+        service._get_calendar_service(tokens)
+        assert len(refreshes) == 1
+
+    def test_today_events_persists_refreshed_tokens(self, refreshes, monkeypatch):
+        from main import app
+
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=engine)
+        TestSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def override_get_db():
+            db = TestSession()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        monkeypatch.setattr(gcal, "gcal_service", gcal.GoogleCalendarService())
+        monkeypatch.setattr("app.api.v1.endpoints.calendar.gcal_service", gcal.gcal_service)
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_current_user] = lambda: {"sub": "user_refresh", "email": "r@example.com"}
+        try:
+            client = TestClient(app)
+            tokens = _expired_tokens()
+            for _ in range(2):
+                response = client.post("/events/today", json={"tokens": tokens})
+                assert response.status_code == 200
+        finally:
+            app.dependency_overrides.clear()
+
+        db = TestSession()
+        user = db.query(User).filter(User.clerk_user_id == "user_refresh").one()
+        stored = decrypt_tokens(user.calendar_tokens)
+        db.close()
+
+        assert len(refreshes) == 1
+        assert stored["access_token"] == "refreshed_access_token"
+        assert datetime.fromisoformat(stored["expiry"]) > datetime.utcnow()
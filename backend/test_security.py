@@ -0,0 +1,110 @@
+"""
+Tests for Clerk token verification caches.
+"""
+import json
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+import app.core.security as security
+from app.core.cache import TTLCache
+
+_private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwk(kid: str) -> dict:
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(_private_key.public_key()))
+    return {**jwk, "kid": kid}
+
+
+def _token(kid: str = "key1", expires_in: float = 3600) -> str:
+    payload = {"sub": "user_1", "exp": int(time.time() + expires_in)}
+    return jwt.encode(payload, _private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def _credentials(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture
+def jwks_fetches(monkeypatch):
+    """Serve a one-key JWKS, counting fetches, with empty caches."""
+    fetches = []
+
+    def fake_get_jwks():
+        fetches.append(time.monotonic())
+        return {"keys": [_jwk("key1"), {"kty": "EC", "kid": "ec"}]}
+
+    monkeypatch.setattr(security, "get_jwks", fake_get_jwks)
+    monkeypatch.setattr(security, "_public_keys", {})
+    monkeypatch.setattr(security, "_jwks_fetched_at", float("-inf"))
+    monkeypatch.setattr(security, "_verified_tokens", TTLCache(maxsize=1024, ttl=security.VERIFIED_TOKEN_MAX_TTL))
+    return fetches
+
+
+class TestPublicKeyCache:
+    """Test that the JWKS is fetched once and refetched only when needed."""
+
+    def test_known_kid_is_served_from_cache(self, jwks_fetches):
+        assert security.get_public_key("key1") is not None
+        assert security.get_public_key("key1") is security.get_public_key("key1")
+        assert len(jwks_fetches) == 1
+
+    def test_non_rsa_keys_are_ignored(self, jwks_fetches):
+        assert security.get_public_key("ec") is None
+
+    def test_unknown_kid_refetch_is_rate_limited(self, jwks_fetches, monkeypatch):
+        security.get_public_key("key1")
+        assert security.get_public_key("rotated") is None
+        assert len(jwks_fetches) == 1
+
+        monkeypatch.setattr(security, "_jwks_fetched_at", time.monotonic() - security.JWKS_MIN_REFRESH_INTERVAL)
+        assert security.get_public_key("rotated") is None
+        assert len(jwks_fetches) == 2
+
+    def test_stale_key_set_is_refetched(self, jwks_fetches, monkeypatch):
+        security.get_public_key("key1")
+        monkeypatch.setattr(security, "_jwks_fetched_at", time.monotonic() - security.JWKS_CACHE_TTL)
+        assert security.get_public_key("key1") is not None
+        assert len(jwks_fetches) == 2
+
+
+class TestVerifiedTokenCache:
+    """Test that verified token payloads are reused until shortly before expiry."""
+
+    def test_payload_is_reused(self, jwks_fetches, monkeypatch):
+        token = _token()
+        payload = security.verify_token(_credentials(token))
+        assert payload["sub"] == "user_1"
+
+        def no_lookup(kid):
+            raise AssertionError("token verified again")
+
+        monkeypatch.setattr(security, "get_public_key", no_lookup)
+        payload["sub"] = "changed"
+        assert security.verify_token(_credentials(token))["sub"] == "user_1"
+
+    def test_token_near_expiry_is_not_cached(self, jwks_fetches):
+        security.verify_token(_credentials(_token(expires_in=security.TOKEN_EXPIRY_MARGIN - 1)))
+        assert len(security._verified_tokens) == 0
+
+    def test_cache_entry_expires_before_token(self, jwks_fetches):
+        token = _token(expires_in=60)
+        security.verify_token(_credentials(token))
+        entry = next(iter(security._verified_tokens._data.values()))
+        assert entry[0] <= time.monotonic() + 60 - security.TOKEN_EXPIRY_MARGIN
+
+    def test_expired_token_is_rejected(self, jwks_fetches):
+        with pytest.raises(HTTPException) as exc_info:
+            security.verify_token(_credentials(_token(expires_in=-10)))
+        assert exc_info.value.status_code == 401
+        assert len(security._verified_tokens) == 0
+
+    def test_unknown_kid_is_rejected(self, jwks_fetches):
+        with pytest.raises(HTTPException) as exc_info:
+            security.verify_token(_credentials(_token(kid="unknown")))
+        assert exc_info.value.status_code == 401
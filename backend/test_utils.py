@@ -0,0 +1,31 @@
+"""
+Tests for shared helpers in app.core.utils.
+"""
+import pytest
+
+from app.core.utils import calculate_cost, format_hhmm, parse_hhmm
+
+
+class TestParseHHMM:
+    """Test the strptime-compatible HH:MM parser."""
+
+    def test_valid_times(self):
+        assert parse_hhmm("00:00") == 0
+        assert parse_hhmm("09:30") == 570
+        assert parse_hhmm("9:30") == 570
+        assert parse_hhmm("23:59") == 1439
+
+    @pytest.mark.parametrize("value", ["", "24:00", "12:60", "9", "9:", "09:00:00", " 09:00", "0a:00", "-1:00"])
+    def test_invalid_times(self, value):
+        with pytest.raises(ValueError):
+            parse_hhmm(value)
+
+    def test_format_round_trip(self):
+        assert format_hhmm(570) == "09:30"
+        assert format_hhmm(parse_hhmm("7:05")) == "07:05"
+
+
+def test_calculate_cost_matches_model_variants():
+    assert calculate_cost("gpt-4o-2024-08-06", 1_000_000, 0) == pytest.approx(5.00)
+    assert calculate_cost("openai/gpt-4o-mini", 0, 1_000_000) == pytest.approx(0.60)
+    assert calculate_cost("unknown-model", 100, 100) == 0.0